@@ -4,151 +4,449 @@ Flask web application for HKJC Race Scraper
 Direct integration - no separate local server needed
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
-import subprocess
+from flask import Flask, Response, request, jsonify, send_from_directory
+from pydantic import BaseModel, Field, ValidationError
+import asyncio
+import atexit
+import gzip
 import json
 import os
-import tempfile
 import threading
 import time
-from datetime import datetime
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as date_type, datetime
+from functools import lru_cache
+from typing import Literal
+
+from playwright.async_api import async_playwright
+
+from hkjc_scraper.constants import get_config
+from hkjc_scraper.main import launch_browser, run_async as scraper_run
+from hkjc_scraper.utils import setup_logging
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
 
 app = Flask(__name__)
 
-# Global variable to store scraping status
-scraping_status = {
-    'is_running': False,
-    'progress': 0,
-    'message': '',
-    'result': None,
-    'error': None
-}
+# Shared worker pool for background scrapes
+EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SCRAPE_WORKERS", "4")),
+    thread_name_prefix="scraper",
+)
 
-def run_scraper_async(date, course, raceno):
-    """Run the scraper in a background thread."""
-    global scraping_status
+# Each worker thread keeps its own event loop and warm browser. Playwright
+# objects are bound to the event loop that created them, so a single browser
+# cannot be shared across the pool; the worker threads are long-lived instead.
+_worker_local = threading.local()
+
+# Every worker's {'loop', 'playwright', 'browser'} state, for shutdown
+WORKER_STATES = []
+WORKER_STATES_LOCK = threading.Lock()
+
+def get_worker_state():
+    """Return this worker thread's state, creating its event loop on first use."""
+    state = getattr(_worker_local, 'state', None)
+    if state is None:
+        state = {'loop': asyncio.new_event_loop(), 'playwright': None, 'browser': None}
+        _worker_local.state = state
+        with WORKER_STATES_LOCK:
+            WORKER_STATES.append(state)
+    
+    return state
+
+def get_worker_loop():
+    """Return this worker thread's event loop, creating it on first use."""
+    return get_worker_state()['loop']
+
+def get_worker_browser():
+    """Return this worker thread's browser, launching it on first use."""
+    state = get_worker_state()
+    loop = state['loop']
+    browser = state['browser']
+    if browser is None or not browser.is_connected():
+        if state['playwright'] is None:
+            state['playwright'] = loop.run_until_complete(async_playwright().start())
+        browser = loop.run_until_complete(
+            launch_browser(state['playwright'], get_config()['headless'])
+        )
+        state['browser'] = browser
     
+    return browser
+
+def close_worker_state(state):
+    """Close a worker's browser, Playwright instance and event loop."""
+    loop = state['loop']
     try:
-        scraping_status['is_running'] = True
-        scraping_status['progress'] = 0
-        scraping_status['message'] = 'Starting scraper...'
-        scraping_status['error'] = None
+        try:
+            if state['browser'] is not None:
+                loop.run_until_complete(state['browser'].close())
+        finally:
+            if state['playwright'] is not None:
+                loop.run_until_complete(state['playwright'].stop())
+    except Exception as e:
+        setup_logging().error(f"Error closing scraper worker: {e}")
+    finally:
+        loop.close()
+
+@atexit.register
+def shutdown_workers():
+    """Stop the worker pool, then close every worker's browser and loop."""
+    # concurrent.futures joins the pool's threads before atexit handlers run,
+    # so close tasks can no longer be submitted to them here. Each worker's
+    # loop is idle once its thread has exited, and is driven to close its
+    # Playwright objects from this thread instead.
+    EXECUTOR.shutdown(wait=True)
+    
+    with WORKER_STATES_LOCK:
+        states = WORKER_STATES[:]
+        WORKER_STATES.clear()
+    
+    for state in states:
+        close_worker_state(state)
+
+# Per-job scraping state, keyed by job id
+JOBS = {}
+JOBS_LOCK = threading.Lock()
+
+# Notified on every job state change; used to push Server-Sent Events
+JOBS_CHANGED = threading.Condition(JOBS_LOCK)
+
+# Seconds between keep-alive comments on an idle event stream
+SSE_KEEPALIVE_SECONDS = 15
+
+# Finished jobs are evicted after this many seconds
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "1800"))
+
+# Scrape results keyed by (date, course, raceno), least recently used first
+RESULT_CACHE = OrderedDict()
+RESULT_CACHE_LOCK = threading.Lock()
+RESULT_CACHE_MAXSIZE = int(os.getenv("RESULT_CACHE_MAXSIZE", "512"))
+
+# Results for today or future races expire after this many seconds;
+# past race cards are immutable and only leave the cache by LRU eviction
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+
+def is_past_race_date(date):
+    """Check whether a YYYY/MM/DD race date is strictly before today."""
+    try:
+        return datetime.strptime(date, '%Y/%m/%d').date() < date_type.today()
+    except ValueError:
+        return False
+
+def get_cached_result(key):
+    """Return the cached result for key, or None if missing or expired."""
+    with RESULT_CACHE_LOCK:
+        entry = RESULT_CACHE.get(key)
+        if entry is None:
+            return None
         
-        # Create temporary output file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            output_file = f.name
+        expires_at, data = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del RESULT_CACHE[key]
+            return None
         
-        # Run the scraper
-        scraping_status['message'] = 'Scraping race data...'
-        scraping_status['progress'] = 25
+        RESULT_CACHE.move_to_end(key)
+        return data
+
+def cache_result(key, payload):
+    """Store a result payload, evicting the least recently used entries."""
+    expires_at = None
+    if not is_past_race_date(key[0]):
+        expires_at = time.monotonic() + RESULT_CACHE_TTL_SECONDS
+    
+    with RESULT_CACHE_LOCK:
+        RESULT_CACHE[key] = (expires_at, payload)
+        RESULT_CACHE.move_to_end(key)
+        while len(RESULT_CACHE) > RESULT_CACHE_MAXSIZE:
+            RESULT_CACHE.popitem(last=False)
+
+class ScrapeRequest(BaseModel):
+    """Body of a POST to /api/scrape."""
+    
+    date: str = Field(min_length=1)
+    course: Literal['HV', 'ST']
+    raceno: int = Field(ge=1, le=12)
+
+def describe_request_error(exc):
+    """Turn the first validation error into the API's error message."""
+    error = exc.errors()[0]
+    field = error['loc'][0] if error['loc'] else None
+    
+    if error['type'] in ('missing', 'string_too_short') or field == 'date':
+        return 'Missing required parameters'
+    if field == 'course':
+        return 'Invalid course. Must be HV or ST'
+    if field == 'raceno':
+        return 'Invalid race number. Must be between 1 and 12'
+    return 'Invalid request body'
+
+def dumps_json(obj, pretty=False):
+    """Serialize obj to UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    
+    return json.dumps(obj, ensure_ascii=False, indent=2 if pretty else None).encode('utf-8')
+
+def build_result_payload(data):
+    """Bundle a result with its compact JSON encoding."""
+    return {
+        'result': data,
+        'result_bytes': dumps_json(data)
+    }
+
+# Browser cache lifetime for the static web interface; revalidated via ETag
+INDEX_MAX_AGE_SECONDS = int(os.getenv("INDEX_MAX_AGE_SECONDS", "3600"))
+
+# Compression level for gzip-encoded downloads
+GZIP_LEVEL = 6
+
+# strftime pattern for download filenames (local time)
+DOWNLOAD_FILENAME_FORMAT = 'hkjc_race_%Y%m%d_%H%M%S.json'
+
+# Job fields exposed by /api/status
+STATUS_FIELDS = ('is_running', 'progress', 'message', 'result', 'error')
+
+@lru_cache(maxsize=64)
+def constant_json_body(key, message):
+    """Encode a one-field JSON object once; used for fixed API messages."""
+    return dumps_json({key: message})
+
+def json_response(body, status=200):
+    """Wrap pre-encoded JSON bytes in a response."""
+    return Response(body, status=status, mimetype='application/json')
+
+def error_response(message, status):
+    """Build an error response, reusing the encoded body for fixed messages."""
+    return json_response(constant_json_body('error', message), status)
+
+def new_job_state():
+    """Create the initial state for a scraping job."""
+    return {
+        'is_running': True,
+        'progress': 0,
+        'message': 'Queued',
+        'result': None,
+        'result_bytes': None,
+        'error': None,
+        'finished_at': None,
+        'version': 0
+    }
+
+def sweep_jobs():
+    """Evict finished jobs older than JOB_TTL_SECONDS."""
+    cutoff = time.monotonic() - JOB_TTL_SECONDS
+    with JOBS_LOCK:
+        expired = [
+            job_id for job_id, job in JOBS.items()
+            if job['finished_at'] is not None and job['finished_at'] < cutoff
+        ]
+        for job_id in expired:
+            del JOBS[job_id]
+        if expired:
+            JOBS_CHANGED.notify_all()
+
+def get_job():
+    """Snapshot the job named by the ``job`` query parameter."""
+    with JOBS_LOCK:
+        job = JOBS.get(request.args.get('job', ''))
+        return dict(job) if job is not None else None
+
+def update_job(job_id, **changes):
+    """Apply a multi-field state transition to a job atomically."""
+    with JOBS_CHANGED:
+        job = JOBS[job_id]
+        job.update(changes)
+        job['version'] += 1
+        JOBS_CHANGED.notify_all()
+
+def status_view(job):
+    """Select the job fields exposed to clients."""
+    return {field: job[field] for field in STATUS_FIELDS}
+
+def stream_job_events(job_id):
+    """Yield SSE messages for each state change of a job until it finishes."""
+    seen_version = -1
+    while True:
+        with JOBS_CHANGED:
+            JOBS_CHANGED.wait_for(
+                lambda: job_id not in JOBS or JOBS[job_id]['version'] != seen_version,
+                timeout=SSE_KEEPALIVE_SECONDS
+            )
+            job = JOBS.get(job_id)
+            if job is None:
+                return
+            snapshot = dict(job)
         
-        result = subprocess.run([
-            'python', '-m', 'hkjc_scraper',
-            '--date', date,
-            '--course', course,
-            '--raceno', str(raceno),
-            '--out', output_file,
-            '--log-level', 'INFO'
-        ], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        if snapshot['version'] == seen_version:
+            yield ': keep-alive\n\n'
+            continue
         
-        scraping_status['progress'] = 75
-        scraping_status['message'] = 'Processing results...'
+        seen_version = snapshot['version']
+        yield f"data: {dumps_json(status_view(snapshot)).decode('utf-8')}\n\n"
         
-        if result.returncode != 0:
-            scraping_status['error'] = f"Scraper failed: {result.stderr}"
-            scraping_status['is_running'] = False
+        if not snapshot['is_running']:
             return
+
+def run_scraper_async(job_id, date, course, raceno):
+    """Run the scraper in a background thread."""
+    try:
+        # Run the scraper in-process
+        update_job(job_id, progress=25, message='Scraping race data...')
+        
+        browser = get_worker_browser()
+        horses = get_worker_loop().run_until_complete(
+            scraper_run(date, course, raceno, browser=browser)
+        )
         
-        # Read the output file
-        with open(output_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        update_job(job_id, progress=75, message='Processing results...')
         
-        # Clean up temporary file
-        os.unlink(output_file)
+        payload = build_result_payload([horse.model_dump() for horse in horses])
+        if payload['result']:
+            cache_result((date, course, raceno), payload)
         
-        scraping_status['progress'] = 100
-        scraping_status['message'] = 'Scraping complete!'
-        scraping_status['result'] = data
-        scraping_status['is_running'] = False
+        update_job(
+            job_id,
+            progress=100,
+            message='Scraping complete!',
+            is_running=False,
+            finished_at=time.monotonic(),
+            **payload
+        )
         
     except Exception as e:
-        scraping_status['error'] = f"Error: {str(e)}"
-        scraping_status['is_running'] = False
+        update_job(
+            job_id,
+            error=f"Error: {str(e)}",
+            is_running=False,
+            finished_at=time.monotonic()
+        )
 
 @app.route('/')
 def index():
     """Serve the main web interface."""
-    return render_template('index.html')
+    return send_from_directory(app.static_folder, 'index.html', max_age=INDEX_MAX_AGE_SECONDS)
 
 @app.route('/api/scrape', methods=['POST'])
 def scrape():
     """API endpoint to start scraping."""
-    global scraping_status
-    
-    if scraping_status['is_running']:
-        return jsonify({
-            'error': 'Scraper is already running. Please wait for it to complete.'
-        }), 400
-    
-    data = request.json
-    date = data.get('date')
-    course = data.get('course')
-    raceno = data.get('raceno')
+    # Parse and validate the raw body in a single pass
+    try:
+        params = ScrapeRequest.model_validate_json(request.get_data())
+    except ValidationError as e:
+        return error_response(describe_request_error(e), 400)
     
-    if not all([date, course, raceno]):
-        return jsonify({'error': 'Missing required parameters'}), 400
+    date, course, raceno = params.date, params.course, params.raceno
     
-    if course not in ['HV', 'ST']:
-        return jsonify({'error': 'Invalid course. Must be HV or ST'}), 400
+    sweep_jobs()
+    job_id = uuid.uuid4().hex
     
-    if not (1 <= raceno <= 12):
-        return jsonify({'error': 'Invalid race number. Must be between 1 and 12'}), 400
+    # Serve repeat requests straight from the result cache
+    cached = get_cached_result((date, course, raceno))
+    if cached is not None:
+        job = new_job_state()
+        job.update({
+            'is_running': False,
+            'progress': 100,
+            'message': 'Scraping complete!',
+            'finished_at': time.monotonic()
+        })
+        job.update(cached)
+        with JOBS_LOCK:
+            JOBS[job_id] = job
+        
+        return jsonify({
+            'message': 'Result served from cache',
+            'status': 'done',
+            'job_id': job_id
+        })
     
-    # Start scraping in background thread
-    thread = threading.Thread(target=run_scraper_async, args=(date, course, raceno))
-    thread.daemon = True
-    thread.start()
+    # Register the job and start scraping on the worker pool
+    with JOBS_LOCK:
+        JOBS[job_id] = new_job_state()
+    EXECUTOR.submit(run_scraper_async, job_id, date, course, raceno)
     
     return jsonify({
         'message': 'Scraping started',
-        'status': 'running'
+        'status': 'running',
+        'job_id': job_id
     })
 
 @app.route('/api/status')
 def status():
-    """Get current scraping status."""
-    return jsonify(scraping_status)
+    """Get current scraping status for a job."""
+    job = get_job()
+    if job is None:
+        return error_response('Unknown job', 404)
+    
+    return jsonify(status_view(job))
+
+@app.route('/api/events/<job_id>')
+def events(job_id):
+    """Stream status updates for a job as Server-Sent Events."""
+    with JOBS_LOCK:
+        if job_id not in JOBS:
+            return error_response('Unknown job', 404)
+    
+    return Response(
+        stream_job_events(job_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 @app.route('/api/result')
 def result():
-    """Get scraping result if available."""
-    if scraping_status['result']:
-        return jsonify(scraping_status['result'])
-    elif scraping_status['error']:
-        return jsonify({'error': scraping_status['error']}), 500
+    """Get scraping result for a job if available."""
+    job = get_job()
+    if job is None:
+        return error_response('Unknown job', 404)
+    
+    if job['result']:
+        return json_response(job['result_bytes'])
+    elif job['error']:
+        return jsonify({'error': job['error']}), 500
     else:
-        return jsonify({'message': 'No result available yet'}), 404
+        return json_response(constant_json_body('message', 'No result available yet'), 404)
 
 @app.route('/api/download')
 def download():
-    """Download the scraped data as JSON file."""
-    if not scraping_status['result']:
-        return jsonify({'error': 'No data available to download'}), 404
+    """Download the scraped data for a job as JSON file.
     
-    # Create temporary file for download
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        json.dump(scraping_status['result'], f, ensure_ascii=False, indent=2)
-        temp_file = f.name
+    Pass ``pretty=1`` for indented JSON.
+    """
+    job = get_job()
+    if job is None or not job['result']:
+        return error_response('No data available to download', 404)
     
     # Generate filename
-    filename = f"hkjc_race_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    filename = time.strftime(DOWNLOAD_FILENAME_FORMAT)
     
-    return send_file(
-        temp_file,
-        as_attachment=True,
-        download_name=filename,
-        mimetype='application/json'
-    )
+    # Compact JSON by default; ?pretty=1 opts into indented output
+    if request.args.get('pretty') == '1':
+        body = dumps_json(job['result'], pretty=True)
+    else:
+        body = job['result_bytes']
+    
+    # Compress on the wire when the client accepts it; gzip;q=0 is a refusal
+    use_gzip = request.accept_encodings['gzip'] > 0
+    if use_gzip:
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+    
+    # Whole-body response; Content-Length is the length of the bytes sent
+    response = json_response(body)
+    response.headers.set('Content-Disposition', 'attachment', filename=filename)
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    
+    return response
 
 if __name__ == '__main__':
     print("🏇 HKJC Race Scraper - Flask Web Application")
@@ -157,4 +455,5 @@ if __name__ == '__main__':
     print("Open your browser and go to: http://localhost:8080")
     print("=" * 50)
     
-    app.run(debug=True, host='0.0.0.0', port=8080)
+    # Development server only; use gunicorn in production (see README_FLASK.md)
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1', host='0.0.0.0', port=8080)
@@ -1,7 +1,9 @@
 """Constants and configuration for HKJC scraper."""
 
 import os
-from typing import Dict, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, List, Mapping
 
 # URL templates
 RACECARD_URL_TEMPLATE = (
@@ -9,6 +11,15 @@ RACECARD_URL_TEMPLATE = (
     "RaceCard.aspx?RaceDate={date}&Racecourse={course}&RaceNo={raceno}"
 )
 
+# Race numbers run from 1 to this at a meeting
+MAX_RACES_PER_MEETING = 12
+
+# Veterinary records database, shared by all horses
+INJURY_DATABASE_URL = (
+    "https://racing.hkjc.com/racing/information/Chinese/VeterinaryRecords/"
+    "OveDatabase.aspx"
+)
+
 # Expected table headers in Chinese (based on actual HKJC website structure)
 EXPECTED_HEADERS = [
     "編號",      # Horse number (馬號)
@@ -31,6 +42,9 @@ EXPECTED_HEADERS = [
     "國際評分",  # International rating
 ]
 
+# Set view of EXPECTED_HEADERS for O(1) membership tests
+EXPECTED_HEADERS_SET = frozenset(EXPECTED_HEADERS)
+
 # Tab names for horse detail pages
 DETAIL_TABS = {
     "injuries": ["傷病記錄", "健康記錄", "醫療記錄"],
@@ -53,9 +67,14 @@ SELECTORS = {
 }
 
 # Configuration from environment variables
-def get_config() -> Dict[str, any]:
-    """Get configuration from environment variables with defaults."""
-    return {
+@lru_cache(maxsize=1)
+def get_config() -> Mapping[str, Any]:
+    """Get configuration from environment variables with defaults.
+    
+    The result is read once per process and returned as a read-only mapping;
+    callers that need overrides should copy it with ``dict(get_config())``.
+    """
+    return MappingProxyType({
         "headless": os.getenv("HEADLESS", "true").lower() == "true",
         "min_delay_ms": int(os.getenv("MIN_DELAY_MS", "400")),
         "max_delay_ms": int(os.getenv("MAX_DELAY_MS", "1200")),
@@ -66,15 +85,33 @@ def get_config() -> Dict[str, any]:
         "retry_base_delay_ms": int(os.getenv("RETRY_BASE_DELAY_MS", "1000")),
         "retry_max_delay_ms": int(os.getenv("RETRY_MAX_DELAY_MS", "5000")),
         "checkpoint_interval": int(os.getenv("CHECKPOINT_INTERVAL", "2")),
+        "concurrency": int(os.getenv("CONCURRENCY", "3")),
+        "race_concurrency": int(os.getenv("RACE_CONCURRENCY", "3")),
+        "storage_state_path": os.getenv("STORAGE_STATE_PATH", ""),
+        "detail_cache_path": os.getenv("DETAIL_CACHE_PATH", ""),
+        "http_fetch": os.getenv("HTTP_FETCH", "true").lower() == "true",
+        "block_resources": os.getenv("BLOCK_RESOURCES", "true").lower() == "true",
         "user_agent": os.getenv(
             "USER_AGENT",
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
             "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         ),
-    }
+    })
+
+# Chromium launch flags (container friendly)
+BROWSER_LAUNCH_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--blink-settings=imagesEnabled=false",
+]
+
+# Resource types aborted by the request router; only the DOM text is scraped
+BLOCKED_RESOURCE_TYPES = frozenset(["image", "font", "stylesheet", "media"])
 
 # Valid racecourses
 VALID_COURSES = ["HV", "ST"]
+VALID_COURSES_SET = frozenset(VALID_COURSES)
 
 # Date format
 DATE_FORMAT = "%Y/%m/%d"
@@ -1,76 +1,560 @@
 """Horse detail page scraping module for injuries, past runs, and profile data."""
 
-from typing import Dict, List, Optional
+import asyncio
+import re
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
 
-from playwright.sync_api import Browser, Page
+from playwright.async_api import Browser, BrowserContext, Page
 
-from .constants import DETAIL_TABS, get_config
+try:
+    import httpx
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # Load every horse page with Playwright
+    httpx = None
+    LexborHTMLParser = None
+
+from .constants import DETAIL_TABS, INJURY_DATABASE_URL, get_config
 from .models import InjuryRecord, PastRunRecord
 from .selectors import SelectorHelper
 from .utils import (
+    block_unneeded_resources,
     extract_href_safe,
     extract_text_safe,
+    load_cached_details,
+    load_storage_state,
     normalize_text,
+    open_detail_cache,
+    parse_horse_id,
     random_delay,
     retry_with_backoff,
+    save_cached_details,
+    save_storage_state,
     setup_logging,
     wait_for_selector_safe,
 )
 
+# First run of digits, e.g. the value in an international rating label
+_DIGITS_RE = re.compile(r'(\d+)')
+
+# Race result pairs in profile text, e.g. "843: 06"
+_RACE_RESULT_RE = re.compile(r'(\d+):\s*(\d+)')
+
+# Header keywords that identify a comprehensive past-performance table
+_COMPREHENSIVE_INDICATORS = frozenset([
+    "場次", "名次", "日期", "馬場", "跑道", "賽道", "途程", "場地狀況",
+    "賽事班次", "檔位", "評分", "練馬師", "騎師", "頭馬距離", "獨贏賠率",
+    "實際負磅", "沿途走位", "完成時間", "排位體重", "配備",
+])
+
+# Header keywords that identify a basic past-performance table
+_BASIC_INDICATORS = frozenset([
+    "日期", "場地", "途程", "檔位", "負磅", "騎師", "名次", "時間", "配備", "評分", "獨贏",
+])
+
+_ALL_INDICATORS = _COMPREHENSIVE_INDICATORS | _BASIC_INDICATORS
+
+# PastRunRecord fields and the headers they may appear under, in priority order
+_COMPREHENSIVE_FIELD_ALIASES = (
+    ("race_date", ("日期", "Date")),
+    ("venue", ("馬場", "跑道", "賽道", "場地", "Venue")),
+    ("distance", ("途程", "Distance")),
+    ("barrier", ("檔位", "Barrier")),
+    ("weight", ("實際負磅", "負磅", "Weight")),
+    ("jockey", ("騎師", "Jockey")),
+    ("position", ("名次", "Position")),
+    ("time", ("完成時間", "時間", "Time")),
+    ("equipment", ("配備", "Equipment")),
+    ("rating", ("評分", "Rating")),
+    ("odds", ("獨贏賠率", "獨贏", "Odds")),
+)
+
+_COMPREHENSIVE_EXTRA_FIELD_ALIASES = (
+    ("track_condition", ("場地狀況", "Track Condition")),
+    ("race_class", ("賽事班次", "Class")),
+    ("distance_to_winner", ("頭馬距離", "Distance to Winner")),
+    ("running_position", ("沿途走位", "Running Position")),
+    ("barrier_weight", ("排位體重", "Barrier Weight")),
+    ("trainer", ("練馬師", "Trainer")),
+)
+
+_BASIC_FIELD_ALIASES = (
+    ("race_date", ("日期", "Date")),
+    ("venue", ("場地", "Venue")),
+    ("distance", ("途程", "Distance")),
+    ("barrier", ("檔位", "Barrier")),
+    ("weight", ("負磅", "Weight")),
+    ("jockey", ("騎師", "Jockey")),
+    ("position", ("名次", "Position")),
+    ("time", ("時間", "Time")),
+    ("equipment", ("配備", "Equipment")),
+    ("rating", ("評分", "Rating")),
+    ("odds", ("獨贏", "Odds")),
+)
+
+# Tab-table fields and the headers they may appear under, in priority order
+_TAB_PAST_RUN_FIELD_ALIASES = (
+    ("race_date", ("賽事日期", "Date")),
+    ("venue", ("場地", "Venue")),
+    ("distance", ("途程", "Distance")),
+    ("barrier", ("檔位", "Barrier")),
+    ("weight", ("負磅", "Weight")),
+    ("jockey", ("騎師", "Jockey")),
+    ("position", ("名次", "Position")),
+    ("time", ("時間", "Time")),
+    ("equipment", ("配備", "Equipment")),
+    ("rating", ("評分", "Rating")),
+    ("odds", ("獨贏", "Odds")),
+)
+
+_TAB_INJURY_FIELD_ALIASES = (
+    ("date", ("日期", "Date")),
+    ("description", ("描述", "Description", "傷病")),
+)
+
+# Labels that mark horse profile details on the main page
+_PROFILE_LABELS = (
+    "年齡", "性別", "毛色", "出生地", "父系", "母系", "馬主",
+    "Age", "Sex", "Color", "Country", "Sire", "Dam", "Owner",
+)
+
+# Where the horse name may appear on a detail page, in priority order
+_HORSE_NAME_SELECTORS = ("h1", ".horse-name", ".title", "title")
+
+# Label and classes marking the international rating on a detail page
+_RATING_LABELS = ("國際評分", "international rating")
+_RATING_SELECTORS = (".international-rating", ".rating-international")
+
+# Playwright selectors for the international rating, in priority order
+_RATING_PAGE_SELECTORS = ("text=國際評分", "text=International Rating", *_RATING_SELECTORS)
+
+# [element text, parent text] for every element whose own text contains a
+# label (case-insensitive), grouped by label in the order given
+_PROFILE_LABELS_JS = """(labels) => {
+    const needles = labels.map(label => label.toLowerCase());
+    const matches = needles.map(() => []);
+    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+    for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+        const element = node.parentElement;
+        if (!element || !element.parentElement || element.closest('script, style')) {
+            continue;
+        }
+        const text = node.textContent.toLowerCase();
+        needles.forEach((needle, i) => {
+            if (text.includes(needle)) {
+                matches[i].push([element.innerText, element.parentElement.innerText]);
+            }
+        });
+    }
+    return matches.flat();
+}"""
+
+# Containers that may hold the profile tab's content, in priority order
+_PROFILE_CONTENT_SELECTORS = (".profile", ".basicInfo", ".horseInfo", ".tabContent", ".content")
+
+# innerText of the first selector (in the order given) that matches, or null
+_FIRST_MATCH_TEXT_JS = """(selectors) => {
+    for (const selector of selectors) {
+        const element = document.querySelector(selector);
+        if (element) {
+            return element.innerText;
+        }
+    }
+    return null;
+}"""
+
+# Cell texts of every table on the page as [table][row][cell]
+_TABLES_JS = """() => Array.from(document.querySelectorAll('table')).map(
+    t => Array.from(t.rows).map(r => Array.from(r.cells).map(c => c.innerText))
+)"""
+
+# Table cell texts plus the full body text, for the profile-text fallback
+_PAGE_CONTENT_JS = f"""() => ({{
+    tables: ({_TABLES_JS})(),
+    text: document.body.innerText,
+}})"""
+
+
+@lru_cache(maxsize=1024)
+def _find_indicators(header_text: str) -> FrozenSet[str]:
+    """Return the indicators occurring in newline-joined table headers.
+    
+    Headers are normalized and never contain newlines, so a substring hit in
+    the joined text is a hit in some header. HKJC pages repeat the same few
+    header rows, so nearly every table is a cache hit.
+    """
+    return frozenset(indicator for indicator in _ALL_INDICATORS if indicator in header_text)
+
+
+def _table_rows(table) -> List[Any]:
+    """Return a selectolax table's own rows, like ``HTMLTableElement.rows``."""
+    rows = []
+    for child in table.iter():
+        if child.tag in ("thead", "tbody", "tfoot"):
+            rows.extend(row for row in child.iter() if row.tag == "tr")
+        elif child.tag == "tr":
+            rows.append(child)
+    return rows
+
+
+@lru_cache(maxsize=4096)
+def _horse_name_from_title(title: str) -> str:
+    """Extract the horse name from a title like "友得盈 - 馬匹資料"."""
+    return title.split(" - ")[0].strip()
+
+
+class InjuryIndex:
+    """Veterinary database records by horse name, scraped once on first use.
+    
+    Share one instance between the detail scrapers of a meeting's races so
+    the database page is loaded and parsed once for all of them.
+    """
+    
+    def __init__(self):
+        self.records: Optional[Dict[str, List[InjuryRecord]]] = None
+        self.lock = asyncio.Lock()
+
 
 class HorseDetailScraper:
     """Scraper for individual horse detail pages."""
     
-    def __init__(self, browser: Browser, logger=None):
+    def __init__(self, browser: Browser, logger=None, injury_index: Optional[InjuryIndex] = None):
         self.browser = browser
         self.logger = logger or setup_logging()
         self.config = get_config()
+        
+        # Reusable pages, one per browser context, created lazily up to
+        # config["concurrency"]; the semaphore also bounds how many horse
+        # pages load at once
+        self._page_slots = asyncio.Semaphore(self.config["concurrency"])
+        self._idle_pages: List[Page] = []
+        self._contexts: List[BrowserContext] = []
+        
+        # Plain HTTP client for server-rendered pages; Playwright is the fallback
+        self._http = None
+        if httpx is not None and self.config["http_fetch"]:
+            self._http = httpx.AsyncClient(
+                headers={"User-Agent": self.config["user_agent"]},
+                timeout=self.config["page_load_timeout"] / 1000,
+                follow_redirects=True,
+            )
+        
+        # Today's scraped details by URL, kept on disk across runs if configured
+        self._detail_cache = None
+        if self.config["detail_cache_path"]:
+            self._detail_cache = open_detail_cache(self.config["detail_cache_path"], self.logger)
+        
+        # Veterinary database records by horse name, scraped once per scraper
+        # unless an index shared with other scrapers is given
+        self._injury_index = injury_index if injury_index is not None else InjuryIndex()
+    
+    async def _acquire_page(self) -> Page:
+        """Check out a pooled page, creating a context and page if none is idle."""
+        await self._page_slots.acquire()
+        try:
+            if self._idle_pages:
+                page = self._idle_pages.pop()
+                if not page.is_closed():
+                    return page
+                # Closed after a failed scrape; reopen in the same context
+                return await page.context.new_page()
+            
+            context = await self.browser.new_context(
+                user_agent=self.config["user_agent"],
+                storage_state=self._load_storage_state(),
+            )
+            self._contexts.append(context)
+            if self.config["block_resources"]:
+                await context.route("**/*", block_unneeded_resources)
+            return await context.new_page()
+        except BaseException:
+            self._page_slots.release()
+            raise
+    
+    def _release_page(self, page: Page) -> None:
+        """Return a page to the pool."""
+        self._idle_pages.append(page)
+        self._page_slots.release()
+    
+    def _load_storage_state(self) -> Optional[Dict[str, Any]]:
+        """Load the persisted HKJC session for a new context, if configured."""
+        if not self.config["storage_state_path"]:
+            return None
+        return load_storage_state(self.config["storage_state_path"], self.logger)
+    
+    async def close(self) -> None:
+        """Persist the session and close all pooled browser contexts."""
+        if self._contexts and self.config["storage_state_path"]:
+            try:
+                state = await self._contexts[0].storage_state()
+                save_storage_state(state, self.config["storage_state_path"], self.logger)
+            except Exception as e:
+                self.logger.debug(f"Error reading storage state: {e}")
+        
+        for context in self._contexts:
+            try:
+                await context.close()
+            except Exception as e:
+                self.logger.debug(f"Error closing browser context: {e}")
+        
+        self._contexts.clear()
+        self._idle_pages.clear()
+        
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        
+        if self._detail_cache is not None:
+            self._detail_cache.close()
+            self._detail_cache = None
+    
+    async def scrape_many(
+        self,
+        detail_urls: List[str],
+        on_result: Optional[Callable[[int, Optional[Dict[str, Any]]], None]] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Scrape several horse detail pages concurrently.
+        
+        Results are returned in the order of ``detail_urls``; a horse that
+        still fails after retries is logged and left as ``None``. If given,
+        ``on_result(index, details)`` is called as each horse finishes.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(detail_urls)
+        
+        async def _scrape_one(index: int, detail_url: str) -> None:
+            try:
+                results[index] = await self.scrape_horse_details(detail_url)
+            except Exception as e:
+                self.logger.error(f"Error scraping horse details {detail_url}: {e}")
+            
+            if on_result is not None:
+                on_result(index, results[index])
+        
+        await asyncio.gather(*(
+            _scrape_one(index, detail_url)
+            for index, detail_url in enumerate(detail_urls)
+        ))
+        return results
     
-    def scrape_horse_details(self, detail_url: str) -> Dict[str, any]:
+    async def scrape_horse_details(self, detail_url: str) -> Dict[str, any]:
         """Scrape all details for a horse from its detail page."""
         if not detail_url:
             return {}
         
+        if self._detail_cache is not None:
+            details = load_cached_details(self._detail_cache, detail_url, self.logger)
+            if details is not None:
+                self.logger.info(f"Using cached horse details: {detail_url}")
+                return details
+        
         self.logger.info(f"Scraping horse details: {detail_url}")
         
-        def _scrape():
-            page = self.browser.new_page()
+        details = None
+        if self._http is not None:
+            details = await self._scrape_over_http(detail_url)
+        if details is None:
+            details = await self._scrape_with_browser(detail_url)
+        
+        if self._detail_cache is not None:
+            save_cached_details(self._detail_cache, detail_url, details, self.logger)
+        
+        return details
+    
+    async def _scrape_with_browser(self, detail_url: str) -> Dict[str, Any]:
+        """Scrape a horse detail page in a pooled browser context, with retries."""
+        async def _scrape():
+            page = await self._acquire_page()
             try:
-                # Set user agent
-                page.set_extra_http_headers({
-                    "User-Agent": self.config["user_agent"]
-                })
-                
                 # Navigate to horse detail page
-                page.goto(detail_url, timeout=self.config["page_load_timeout"])
+                await page.goto(
+                    detail_url,
+                    wait_until="domcontentloaded",
+                    timeout=self.config["page_load_timeout"],
+                )
                 
-                # Wait for page to load
-                wait_for_selector_safe(page, "body", self.config["selector_timeout"], self.logger)
-                random_delay()
+                # Wait for the tables the scrape reads, not the whole page load
+                await wait_for_selector_safe(
+                    page, "table", self.config["selector_timeout"], self.logger, state="attached"
+                )
+                await random_delay()
                 
                 # Extract all detail data
                 details = {}
                 
-                # Extract horse ID and international rating from page
-                details.update(self._extract_basic_info(page))
+                # The horse page reads are independent, so issue them together:
+                # ID and rating, every table's cell texts with the body text,
+                # profile label matches, and the horse name
+                basic_info, content, profile_matches, horse_name = await asyncio.gather(
+                    self._extract_basic_info(page),
+                    page.evaluate(_PAGE_CONTENT_JS),
+                    self._read_profile_matches(page),
+                    self._extract_horse_name_from_page(page),
+                )
+                details.update(basic_info)
+                tables = content["tables"]
                 
                 # Scrape past performance records from the main page
-                details["往績紀錄"] = self._scrape_past_runs_from_main_page(page)
+                details["往績紀錄"] = self._scrape_past_runs_from_main_page(tables, content["text"])
                 
-                # Scrape horse profile from the main page
-                details["馬匹基本資料"] = self._scrape_profile_from_main_page(page)
+                # Build horse profile from the main page
+                details["馬匹基本資料"] = self._build_profile_text(profile_matches, tables)
                 
-                # Scrape injuries/health records from separate page
-                details["傷病記錄"] = self._scrape_injuries_from_separate_page(page)
+                # Scrape injuries/health records last; this may navigate the page
+                details["傷病記錄"] = await self._scrape_injuries_from_separate_page(page, horse_name)
                 
                 return details
                 
+            except Exception:
+                # Retry on a fresh page; the context and its session are kept
+                await page.close()
+                raise
+                
             finally:
-                page.close()
+                self._release_page(page)
+        
+        return await retry_with_backoff(_scrape, logger=self.logger)
+    
+    async def _scrape_over_http(self, detail_url: str) -> Optional[Dict[str, Any]]:
+        """Scrape a horse page from its HTML without a browser.
+        
+        Returns ``None`` when the page cannot be fetched or carries no
+        server-rendered tables, so the caller falls back to Playwright.
+        """
+        async with self._page_slots:
+            try:
+                response = await self._http.get(detail_url)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                self.logger.debug(f"HTTP fetch failed for {detail_url}, using browser: {e}")
+                return None
+            
+            await random_delay()
+        
+        try:
+            content = self._read_detail_html(response.text)
+        except Exception as e:
+            self.logger.debug(f"Error parsing horse page HTML, using browser: {e}")
+            return None
+        
+        if not content["tables"]:
+            self.logger.debug(f"No server-rendered tables at {detail_url}, using browser")
+            return None
+        
+        details = {}
+        
+        horse_id = self._extract_horse_id_from_url(str(response.url))
+        if horse_id:
+            details["馬匹ID"] = horse_id
+        if content["rating"]:
+            details["國際評分"] = content["rating"]
+        
+        tables = content["tables"]
+        details["往績紀錄"] = self._scrape_past_runs_from_main_page(tables, content["text"])
+        details["馬匹基本資料"] = self._build_profile_text(content["profile_matches"], tables)
+        details["傷病記錄"] = await self._lookup_injuries_over_http(content["horse_name"])
+        
+        return details
+    
+    def _read_detail_html(self, html: str) -> Dict[str, Any]:
+        """Read tables, body text, rating, horse name and profile labels from HTML.
         
-        return retry_with_backoff(_scrape, logger=self.logger)
+        Mirrors what the Playwright path reads from the rendered DOM.
+        """
+        tree = LexborHTMLParser(html)
+        tree.strip_tags(["script", "style"])
+        
+        tables = [
+            [
+                [cell.text() for cell in row.iter() if cell.tag in ("td", "th")]
+                for row in _table_rows(table)
+            ]
+            for table in tree.css("table")
+        ]
+        
+        body = tree.body
+        # (element, lowercased own text) for every element with direct text
+        owned_text = []
+        if body is not None:
+            for node in body.css("*"):
+                own_text = node.text(deep=False).lower()
+                if own_text.strip():
+                    owned_text.append((node, own_text))
+        
+        profile_matches = [
+            [node.text(), node.parent.text()]
+            for label in _PROFILE_LABELS
+            for node, own_text in owned_text
+            if label.lower() in own_text and node.parent is not None
+        ]
+        
+        return {
+            "tables": tables,
+            "text": body.text(separator="\n") if body is not None else "",
+            "rating": self._find_international_rating_in_html(tree, owned_text),
+            "horse_name": self._extract_horse_name_from_html(tree),
+            "profile_matches": profile_matches,
+        }
+    
+    def _find_international_rating_in_html(self, tree, owned_text) -> Optional[str]:
+        """Find the international rating in parsed HTML."""
+        candidates = [
+            node for label in _RATING_LABELS
+            for node, own_text in owned_text if label in own_text
+        ]
+        candidates.extend(
+            node for node in (tree.css_first(selector) for selector in _RATING_SELECTORS)
+            if node is not None
+        )
+        
+        for node in candidates:
+            match = _DIGITS_RE.search(node.text())
+            if match:
+                return match.group(1)
+        
+        return None
+    
+    def _extract_horse_name_from_html(self, tree) -> Optional[str]:
+        """Extract the horse name from parsed HTML."""
+        for selector in _HORSE_NAME_SELECTORS:
+            node = tree.css_first(selector)
+            if node is not None:
+                text = normalize_text(node.text())
+                if text and len(text) < 20:  # Reasonable horse name length
+                    return text
+        
+        title = tree.css_first("title")
+        title_text = title.text() if title is not None else ""
+        if "馬匹資料" in title_text:
+            return _horse_name_from_title(title_text)
+        
+        return None
     
-    def _extract_basic_info(self, page: Page) -> Dict[str, str]:
+    async def _lookup_injuries_over_http(self, horse_name: Optional[str]) -> List[InjuryRecord]:
+        """Look up injury records for a horse scraped without a browser page."""
+        if not horse_name:
+            self.logger.debug("Could not extract horse name for injury search")
+            return []
+        
+        try:
+            injury_index = self._injury_index.records
+            if injury_index is None:
+                # The database is scraped on a pooled page, checked out before
+                # the index lock like the browser path does
+                page = await self._acquire_page()
+                try:
+                    injury_index = await self._get_injury_index(page)
+                finally:
+                    self._release_page(page)
+            
+        except Exception as e:
+            self.logger.error(f"Error scraping injuries from separate page: {e}")
+            return []
+        
+        return list(injury_index.get(horse_name, []))
+    
+    async def _extract_basic_info(self, page: Page) -> Dict[str, str]:
         """Extract basic horse information from the page."""
         info = {}
         
@@ -82,7 +566,7 @@ class HorseDetailScraper:
                 info["馬匹ID"] = horse_id
             
             # Try to find international rating on the page
-            international_rating = self._find_international_rating(page)
+            international_rating = await self._find_international_rating(page)
             if international_rating:
                 info["國際評分"] = international_rating
             
@@ -94,58 +578,24 @@ class HorseDetailScraper:
     def _extract_horse_id_from_url(self, url: str) -> Optional[str]:
         """Extract horse ID from URL."""
         try:
-            import re
-            
-            # Pattern 1: Horse.aspx?HorseId=HK_2024_K106 -> extract K106 (last segment)
-            match = re.search(r'HorseId=([A-Z0-9_]+)', url)
-            if match:
-                full_id = match.group(1)
-                # Extract the last segment after the last underscore
-                parts = full_id.split('_')
-                if len(parts) > 1:
-                    return parts[-1]  # Return just the last part (e.g., K106)
-                return full_id
-            
-            # Pattern 2: Horse.aspx?HorseId=12345 (numeric ID)
-            match = re.search(r'HorseId=(\d+)', url)
-            if match:
-                return match.group(1)
-            
-            # Pattern 3: /horse/12345/
-            match = re.search(r'/horse/(\d+)/', url)
-            if match:
-                return match.group(1)
-            
-            # Pattern 4: horse_id=12345
-            match = re.search(r'horse_id=(\d+)', url)
-            if match:
-                return match.group(1)
-            
+            return parse_horse_id(url)
         except Exception as e:
             self.logger.debug(f"Error extracting horse ID from URL: {e}")
         
         return None
     
-    def _find_international_rating(self, page: Page) -> Optional[str]:
+    async def _find_international_rating(self, page: Page) -> Optional[str]:
         """Find international rating on the page."""
         try:
             # Common selectors for international rating
-            selectors = [
-                "text=國際評分",
-                "text=International Rating",
-                ".international-rating",
-                ".rating-international",
-            ]
-            
-            for selector in selectors:
+            for selector in _RATING_PAGE_SELECTORS:
                 try:
-                    element = page.query_selector(selector)
+                    element = await page.query_selector(selector)
                     if element:
                         # Get the rating value (usually in next sibling or parent)
-                        rating_text = element.inner_text()
+                        rating_text = await element.inner_text()
                         # Extract number from text
-                        import re
-                        match = re.search(r'(\d+)', rating_text)
+                        match = _DIGITS_RE.search(rating_text)
                         if match:
                             return match.group(1)
                 except Exception:
@@ -156,141 +606,17 @@ class HorseDetailScraper:
         
         return None
     
-    def _scrape_past_runs_from_main_page(self, page: Page) -> List[PastRunRecord]:
+    def _scrape_past_runs_from_main_page(
+        self, tables: List[List[List[str]]], page_text: str
+    ) -> List[PastRunRecord]:
         """Scrape past performance records from the main horse page."""
-        past_runs = []
-        
         try:
             # First try to find structured race data in tables
-            tables = page.query_selector_all("table")
-            
-            for table in tables:
-                try:
-                    # Check if this table contains race data
-                    rows = table.query_selector_all("tr")
-                    if len(rows) < 2:  # Need at least header + data rows
-                        continue
-                    
-                    # Get header row to identify columns
-                    header_row = rows[0]
-                    header_cells = header_row.query_selector_all("td, th")
-                    headers = []
-                    
-                    for cell in header_cells:
-                        header_text = normalize_text(extract_text_safe(cell))
-                        headers.append(header_text)
-                    
-                    # Check if this looks like a comprehensive race results table
-                    comprehensive_indicators = ["場次", "名次", "日期", "馬場", "跑道", "賽道", "途程", "場地狀況", 
-                                              "賽事班次", "檔位", "評分", "練馬師", "騎師", "頭馬距離", "獨贏賠率", 
-                                              "實際負磅", "沿途走位", "完成時間", "排位體重", "配備"]
-                    found_comprehensive = sum(1 for indicator in comprehensive_indicators 
-                                            if any(indicator in header for header in headers))
-                    
-                    # Also check for basic indicators
-                    basic_indicators = ["日期", "場地", "途程", "檔位", "負磅", "騎師", "名次", "時間", "配備", "評分", "獨贏"]
-                    found_basic = sum(1 for indicator in basic_indicators 
-                                    if any(indicator in header for header in headers))
-                    
-                    if found_comprehensive >= 8:  # Comprehensive table
-                        self.logger.debug(f"Found comprehensive race table with {found_comprehensive} race indicators")
-                        
-                        # Create header mapping
-                        header_mapping = {}
-                        for i, header in enumerate(headers):
-                            header_mapping[header] = i
-                        
-                        # Extract race data (limit to last 6 races)
-                        data_rows = rows[1:7]  # Skip header, take up to 6 races
-                        
-                        for row in data_rows:
-                            try:
-                                cells = row.query_selector_all("td, th")
-                                if len(cells) < 10:  # Need substantial data for comprehensive table
-                                    continue
-                                
-                                # Extract comprehensive race information using header mapping
-                                past_run = PastRunRecord(
-                                    race_date=self._get_cell_value(cells, header_mapping, ["日期", "Date"]),
-                                    venue=self._get_cell_value(cells, header_mapping, ["馬場", "跑道", "賽道", "場地", "Venue"]),
-                                    distance=self._get_cell_value(cells, header_mapping, ["途程", "Distance"]),
-                                    barrier=self._get_cell_value(cells, header_mapping, ["檔位", "Barrier"]),
-                                    weight=self._get_cell_value(cells, header_mapping, ["實際負磅", "負磅", "Weight"]),
-                                    jockey=self._get_cell_value(cells, header_mapping, ["騎師", "Jockey"]),
-                                    position=self._get_cell_value(cells, header_mapping, ["名次", "Position"]),
-                                    time=self._get_cell_value(cells, header_mapping, ["完成時間", "時間", "Time"]),
-                                    equipment=self._get_cell_value(cells, header_mapping, ["配備", "Equipment"]),
-                                    rating=self._get_cell_value(cells, header_mapping, ["評分", "Rating"]),
-                                    odds=self._get_cell_value(cells, header_mapping, ["獨贏賠率", "獨贏", "Odds"])
-                                )
-                                
-                                # Add additional comprehensive fields if available
-                                if hasattr(past_run, '__dict__'):
-                                    past_run.track_condition = self._get_cell_value(cells, header_mapping, ["場地狀況", "Track Condition"])
-                                    past_run.race_class = self._get_cell_value(cells, header_mapping, ["賽事班次", "Class"])
-                                    past_run.distance_to_winner = self._get_cell_value(cells, header_mapping, ["頭馬距離", "Distance to Winner"])
-                                    past_run.running_position = self._get_cell_value(cells, header_mapping, ["沿途走位", "Running Position"])
-                                    past_run.barrier_weight = self._get_cell_value(cells, header_mapping, ["排位體重", "Barrier Weight"])
-                                    past_run.trainer = self._get_cell_value(cells, header_mapping, ["練馬師", "Trainer"])
-                                
-                                # Only add if we have meaningful data
-                                if any([past_run.race_date, past_run.position, past_run.jockey]):
-                                    past_runs.append(past_run)
-                                    
-                            except Exception as e:
-                                self.logger.debug(f"Error parsing comprehensive race row: {e}")
-                                continue
-                                
-                    elif found_basic >= 3:  # Basic table
-                        self.logger.debug(f"Found basic race table with {found_basic} race indicators")
-                        
-                        # Create header mapping
-                        header_mapping = {}
-                        for i, header in enumerate(headers):
-                            header_mapping[header] = i
-                        
-                        # Extract race data (limit to last 6 races)
-                        data_rows = rows[1:7]  # Skip header, take up to 6 races
-                        
-                        for row in data_rows:
-                            try:
-                                cells = row.query_selector_all("td, th")
-                                if len(cells) < len(headers):
-                                    continue
-                                
-                                # Extract basic race information using header mapping
-                                past_run = PastRunRecord(
-                                    race_date=self._get_cell_value(cells, header_mapping, ["日期", "Date"]),
-                                    venue=self._get_cell_value(cells, header_mapping, ["場地", "Venue"]),
-                                    distance=self._get_cell_value(cells, header_mapping, ["途程", "Distance"]),
-                                    barrier=self._get_cell_value(cells, header_mapping, ["檔位", "Barrier"]),
-                                    weight=self._get_cell_value(cells, header_mapping, ["負磅", "Weight"]),
-                                    jockey=self._get_cell_value(cells, header_mapping, ["騎師", "Jockey"]),
-                                    position=self._get_cell_value(cells, header_mapping, ["名次", "Position"]),
-                                    time=self._get_cell_value(cells, header_mapping, ["時間", "Time"]),
-                                    equipment=self._get_cell_value(cells, header_mapping, ["配備", "Equipment"]),
-                                    rating=self._get_cell_value(cells, header_mapping, ["評分", "Rating"]),
-                                    odds=self._get_cell_value(cells, header_mapping, ["獨贏", "Odds"])
-                                )
-                                
-                                # Only add if we have meaningful data
-                                if any([past_run.race_date, past_run.venue, past_run.position]):
-                                    past_runs.append(past_run)
-                                    
-                            except Exception as e:
-                                self.logger.debug(f"Error parsing basic race row: {e}")
-                                continue
-                        
-                        if past_runs:  # If we found structured data, return it
-                            break
-                        
-                except Exception as e:
-                    self.logger.debug(f"Error checking table: {e}")
-                    continue
+            past_runs = self._parse_past_runs_tables(tables)
             
             # If no structured data found, try to parse from profile text
             if not past_runs:
-                past_runs = self._parse_past_runs_from_profile_text(page)
+                past_runs = self._parse_past_runs_from_profile_text(page_text)
             
             self.logger.debug(f"Extracted {len(past_runs)} past run records from main page")
             return past_runs
@@ -299,26 +625,114 @@ class HorseDetailScraper:
             self.logger.error(f"Error scraping past runs from main page: {e}")
             return []
     
-    def _parse_past_runs_from_profile_text(self, page: Page) -> List[PastRunRecord]:
+    def _parse_past_runs_tables(self, tables: List[List[List[str]]]) -> List[PastRunRecord]:
+        """Parse past performance records from table cell texts."""
+        past_runs = []
+        
+        for rows in tables:
+            try:
+                # Check if this table contains race data
+                if len(rows) < 2:  # Need at least header + data rows
+                    continue
+                
+                # Get header row to identify columns
+                headers = [normalize_text(text) for text in rows[0]]
+                
+                # Every indicator found in any header, scanned once per distinct header row
+                found_indicators = _find_indicators("\n".join(headers))
+                
+                # Check if this looks like a comprehensive race results table
+                found_comprehensive = len(found_indicators & _COMPREHENSIVE_INDICATORS)
+                
+                # Also check for basic indicators
+                found_basic = len(found_indicators & _BASIC_INDICATORS)
+                
+                if found_comprehensive >= 8:  # Comprehensive table
+                    self.logger.debug(f"Found comprehensive race table with {found_comprehensive} race indicators")
+                    
+                    # Create header mapping, only used to resolve columns below
+                    header_mapping = {header: i for i, header in enumerate(headers)}
+                    
+                    # Resolve each field's column once for the whole table
+                    columns = self._resolve_columns(
+                        header_mapping,
+                        _COMPREHENSIVE_FIELD_ALIASES + _COMPREHENSIVE_EXTRA_FIELD_ALIASES,
+                    )
+                    
+                    # Extract race data (limit to last 6 races)
+                    data_rows = islice(rows, 1, 7)  # Skip header, take up to 6 races
+                    
+                    for cells in data_rows:
+                        try:
+                            if len(cells) < 10:  # Need substantial data for comprehensive table
+                                continue
+                            
+                            # Extract comprehensive race information, including the
+                            # additional comprehensive fields, using header mapping
+                            past_run = PastRunRecord(**self._row_values(cells, columns))
+                            
+                            # Only add if we have meaningful data
+                            if any([past_run.race_date, past_run.position, past_run.jockey]):
+                                past_runs.append(past_run)
+                                
+                        except Exception as e:
+                            self.logger.debug(f"Error parsing comprehensive race row: {e}")
+                            continue
+                    
+                    if past_runs:  # If we found structured data, return it
+                        break
+                            
+                elif found_basic >= 3:  # Basic table
+                    self.logger.debug(f"Found basic race table with {found_basic} race indicators")
+                    
+                    # Create header mapping, only used to resolve columns below
+                    header_mapping = {header: i for i, header in enumerate(headers)}
+                    
+                    # Resolve each field's column once for the whole table
+                    columns = self._resolve_columns(header_mapping, _BASIC_FIELD_ALIASES)
+                    
+                    # Extract race data (limit to last 6 races)
+                    data_rows = islice(rows, 1, 7)  # Skip header, take up to 6 races
+                    
+                    for cells in data_rows:
+                        try:
+                            if len(cells) < len(headers):
+                                continue
+                            
+                            # Extract basic race information using header mapping
+                            past_run = PastRunRecord(**self._row_values(cells, columns))
+                            
+                            # Only add if we have meaningful data
+                            if any([past_run.race_date, past_run.venue, past_run.position]):
+                                past_runs.append(past_run)
+                                
+                        except Exception as e:
+                            self.logger.debug(f"Error parsing basic race row: {e}")
+                            continue
+                    
+                    if past_runs:  # If we found structured data, return it
+                        break
+                    
+            except Exception as e:
+                self.logger.debug(f"Error checking table: {e}")
+                continue
+        
+        return past_runs
+    
+    def _parse_past_runs_from_profile_text(self, page_text: str) -> List[PastRunRecord]:
         """Parse past runs from profile text that contains race results."""
         past_runs = []
         
         try:
-            # Get all text content from the page
-            page_text = page.inner_text()
-            
             # Look for patterns like "場次: 名次 | 843: 06 | 779: 08 | 730: 10"
-            import re
-            
-            # Pattern to match race results: race_number: position
-            race_pattern = r'(\d+):\s*(\d+)'
-            matches = re.findall(race_pattern, page_text)
+            # and keep only the last 6 races (most recent) while scanning
+            recent_matches = deque(
+                (match.groups() for match in _RACE_RESULT_RE.finditer(page_text)),
+                maxlen=6,
+            )
             
-            if matches:
-                self.logger.debug(f"Found {len(matches)} race result patterns in profile text")
-                
-                # Take the last 6 races (most recent)
-                recent_matches = matches[-6:]
+            if recent_matches:
+                self.logger.debug(f"Using last {len(recent_matches)} race result patterns in profile text")
                 
                 for race_num, position in recent_matches:
                     try:
@@ -348,171 +762,69 @@ class HorseDetailScraper:
         
         return past_runs
     
-    def _scrape_profile_from_main_page(self, page: Page) -> str:
-        """Scrape horse profile/basic information from the main page."""
-        profile_parts = []
-        
+    async def _read_profile_matches(self, page: Page) -> List[List[str]]:
+        """Read horse profile label matches from the main page."""
         try:
-            # Look for horse information in various formats on the page
-            # Try to find text blocks that contain horse details
-            
-            # Look for common horse information patterns
-            info_selectors = [
-                "text=年齡",
-                "text=性別", 
-                "text=毛色",
-                "text=出生地",
-                "text=父系",
-                "text=母系",
-                "text=馬主",
-                "text=Age",
-                "text=Sex",
-                "text=Color",
-                "text=Country",
-                "text=Sire",
-                "text=Dam",
-                "text=Owner"
-            ]
-            
-            for selector in info_selectors:
-                try:
-                    elements = page.query_selector_all(selector)
-                    for element in elements:
-                        # Get the text content and try to find the value
-                        text = normalize_text(extract_text_safe(element))
-                        if text:
-                            # Look for the value in the same row or nearby
-                            parent = element.query_selector("xpath=..")
-                            if parent:
-                                parent_text = normalize_text(extract_text_safe(parent))
-                                if parent_text and len(parent_text) > len(text):
-                                    profile_parts.append(parent_text)
-                except Exception:
-                    continue
-            
-            # Also try to extract from any table that might contain horse info
-            tables = page.query_selector_all("table")
-            for table in tables:
-                try:
-                    rows = table.query_selector_all("tr")
-                    for row in rows:
-                        cells = row.query_selector_all("td, th")
-                        if len(cells) >= 2:
-                            # Check if this looks like horse info (key: value format)
-                            key_text = normalize_text(extract_text_safe(cells[0]))
-                            value_text = normalize_text(extract_text_safe(cells[1]))
-                            
-                            if key_text and value_text and len(key_text) < 10:  # Short key
-                                profile_parts.append(f"{key_text}: {value_text}")
-                except Exception:
-                    continue
-            
-            # Combine all profile information
-            if profile_parts:
-                profile_text = " | ".join(profile_parts)
-                self.logger.debug(f"Extracted profile text: {len(profile_text)} characters")
-                return profile_text
+            # Look for common horse information patterns in one DOM scan
+            return await page.evaluate(_PROFILE_LABELS_JS, list(_PROFILE_LABELS))
             
         except Exception as e:
             self.logger.error(f"Error scraping profile from main page: {e}")
         
+        return []
+    
+    def _build_profile_text(
+        self, matches: List[List[str]], tables: List[List[List[str]]]
+    ) -> str:
+        """Combine profile label matches and key/value table rows into one string."""
+        profile_parts = []
+        
+        for text, parent_text in matches:
+            # Keep the parent's text when it adds the value to the label
+            text = normalize_text(text)
+            parent_text = normalize_text(parent_text)
+            if text and parent_text and len(parent_text) > len(text):
+                profile_parts.append(parent_text)
+        
+        # Also try to extract from any table that might contain horse info
+        profile_parts.extend(self._parse_profile_tables(tables))
+        
+        # Combine all profile information
+        if profile_parts:
+            profile_text = " | ".join(profile_parts)
+            self.logger.debug(f"Extracted profile text: {len(profile_text)} characters")
+            return profile_text
+        
         return ""
     
-    def _scrape_injuries_from_separate_page(self, page: Page) -> List[InjuryRecord]:
-        """Scrape injury records from the veterinary database page."""
-        injuries = []
+    def _parse_profile_tables(self, tables: List[List[List[str]]]) -> List[str]:
+        """Collect short "key: value" pairs from two-column table rows."""
+        profile_parts = []
         
+        for rows in tables:
+            for cells in rows:
+                if len(cells) >= 2:
+                    # Check if this looks like horse info (key: value format)
+                    key_text = normalize_text(cells[0])
+                    value_text = normalize_text(cells[1])
+                    
+                    if key_text and value_text and len(key_text) < 10:  # Short key
+                        profile_parts.append(f"{key_text}: {value_text}")
+        
+        return profile_parts
+    
+    async def _scrape_injuries_from_separate_page(
+        self, page: Page, horse_name: Optional[str]
+    ) -> List[InjuryRecord]:
+        """Look up injury records from the veterinary database page."""
         try:
-            # Extract horse name from current page
-            horse_name = self._extract_horse_name_from_page(page)
-            
             if not horse_name:
                 self.logger.debug("Could not extract horse name for injury search")
                 return []
             
-            # Navigate to the veterinary database page
-            injury_url = "https://racing.hkjc.com/racing/information/Chinese/VeterinaryRecords/OveDatabase.aspx"
-            
-            self.logger.debug(f"Navigating to veterinary database: {injury_url}")
-            
-            page.goto(injury_url, timeout=self.config["page_load_timeout"])
-            wait_for_selector_safe(page, "body", self.config["selector_timeout"], self.logger)
-            random_delay()
-            
-            # Look for the main injury records table
-            # The table contains columns: 烙印編號, 馬名, 日期, 詳情, 通過日期
-            table = page.query_selector("table")
-            
-            if table:
-                # Get all rows from the table
-                rows = table.query_selector_all("tr")
-                self.logger.debug(f"Found table with {len(rows)} rows")
-                
-                # Find rows that contain our horse name
-                for i, row in enumerate(rows):
-                    cells = row.query_selector_all("td, th")
-                    if len(cells) >= 5:  # Should have 5 columns
-                        # Check if this row contains our horse name
-                        row_text = " ".join([normalize_text(extract_text_safe(cell)) for cell in cells])
-                        
-                        if horse_name in row_text:
-                            # Extract the injury record from this row
-                            try:
-                                # Column structure: 烙印編號, 馬名, 日期, 詳情, 通過日期
-                                horse_id_cell = normalize_text(extract_text_safe(cells[0])) if len(cells) > 0 else ""
-                                horse_name_cell = normalize_text(extract_text_safe(cells[1])) if len(cells) > 1 else ""
-                                date_cell = normalize_text(extract_text_safe(cells[2])) if len(cells) > 2 else ""
-                                description_cell = normalize_text(extract_text_safe(cells[3])) if len(cells) > 3 else ""
-                                pass_date_cell = normalize_text(extract_text_safe(cells[4])) if len(cells) > 4 else ""
-                                
-                                # Validate that this is actually our horse
-                                if horse_name_cell == horse_name and date_cell and description_cell:
-                                    injuries.append(InjuryRecord(
-                                        date=date_cell,
-                                        description=description_cell,
-                                        pass_date=pass_date_cell if pass_date_cell != "-" else ""
-                                    ))
-                                    self.logger.debug(f"Found injury record: {date_cell} - {description_cell}")
-                                    
-                                    # Check if there are continuation rows (same horse, no horse name in first cell)
-                                    # Look at subsequent rows to see if they continue this horse's records
-                                    j = i + 1
-                                    while j < len(rows):
-                                        next_row = rows[j]
-                                        next_cells = next_row.query_selector_all("td, th")
-                                        
-                                        if len(next_cells) >= 5:
-                                            # If first cell is empty or contains a date, it's a continuation
-                                            first_cell = normalize_text(extract_text_safe(next_cells[0]))
-                                            second_cell = normalize_text(extract_text_safe(next_cells[1]))
-                                            
-                                            # If second cell is empty and first cell looks like a date, it's a continuation
-                                            if not second_cell and first_cell and ("/" in first_cell or first_cell.isdigit()):
-                                                # This is a continuation row for the same horse
-                                                cont_date = first_cell
-                                                cont_description = normalize_text(extract_text_safe(next_cells[2])) if len(next_cells) > 2 else ""
-                                                cont_pass_date = normalize_text(extract_text_safe(next_cells[3])) if len(next_cells) > 3 else ""
-                                                
-                                                if cont_date and cont_description:
-                                                    injuries.append(InjuryRecord(
-                                                        date=cont_date,
-                                                        description=cont_description,
-                                                        pass_date=cont_pass_date if cont_pass_date != "-" else ""
-                                                    ))
-                                                    self.logger.debug(f"Found continuation injury record: {cont_date} - {cont_description}")
-                                                j += 1
-                                                continue
-                                            else:
-                                                # Next row is for a different horse, stop
-                                                break
-                                        else:
-                                            break
-                                    
-                                    break  # Found our horse, no need to continue searching
-                                    
-                            except Exception as e:
-                                self.logger.debug(f"Error parsing injury row: {e}")
-                                continue
+            # Everything else has been read from the horse page by now
+            injury_index = await self._get_injury_index(page)
+            injuries = list(injury_index.get(horse_name, []))
             
         except Exception as e:
             self.logger.error(f"Error scraping injuries from separate page: {e}")
@@ -521,88 +833,175 @@ class HorseDetailScraper:
         self.logger.debug(f"Extracted {len(injuries)} injury records")
         return injuries
     
-    def _get_cell_value(self, cells, header_mapping, possible_headers):
-        """Get cell value by trying multiple possible header names."""
-        for header in possible_headers:
-            if header in header_mapping:
-                idx = header_mapping[header]
-                if idx < len(cells):
-                    return normalize_text(extract_text_safe(cells[idx]))
-        return ""
+    async def _get_injury_index(self, page: Page) -> Dict[str, List[InjuryRecord]]:
+        """Return injury records by horse name, scraping the database on first use."""
+        async with self._injury_index.lock:
+            if self._injury_index.records is None:
+                self._injury_index.records = await self._build_injury_index(page)
+        
+        return self._injury_index.records
     
-    def _extract_horse_name_from_page(self, page: Page) -> Optional[str]:
+    async def _build_injury_index(self, page: Page) -> Dict[str, List[InjuryRecord]]:
+        """Scrape the veterinary database once and index it by horse name.
+        
+        Navigates the caller's page; every pooled page may be checked out.
+        """
+        self.logger.debug(f"Navigating to veterinary database: {INJURY_DATABASE_URL}")
+        
+        await page.goto(
+            INJURY_DATABASE_URL,
+            wait_until="domcontentloaded",
+            timeout=self.config["page_load_timeout"],
+        )
+        await wait_for_selector_safe(
+            page, "table", self.config["selector_timeout"], self.logger, state="attached"
+        )
+        await random_delay()
+        
+        # Look for the main injury records table
+        # The table contains columns: 烙印編號, 馬名, 日期, 詳情, 通過日期
+        tables = await page.evaluate(_TABLES_JS)
+        
+        if not tables:
+            return {}
+        
+        self.logger.debug(f"Found table with {len(tables[0])} rows")
+        return self._parse_injury_index(tables[0])
+    
+    def _parse_injury_index(self, rows: List[List[str]]) -> Dict[str, List[InjuryRecord]]:
+        """Group veterinary table rows into injury records by horse name."""
+        injury_index: Dict[str, List[InjuryRecord]] = {}
+        
+        # Horse whose records the following continuation rows belong to
+        last_horse = None
+        
+        for cells in rows:
+            if len(cells) < 5:  # Should have 5 columns
+                last_horse = None
+                continue
+            
+            try:
+                # Column structure: 烙印編號, 馬名, 日期, 詳情, 通過日期
+                first_cell = normalize_text(cells[0])
+                horse_name_cell = normalize_text(cells[1])
+                
+                if horse_name_cell:
+                    last_horse = None
+                    date_cell = normalize_text(cells[2])
+                    description_cell = normalize_text(cells[3])
+                    
+                    # Only the first block of records per horse is kept
+                    if horse_name_cell not in injury_index and date_cell and description_cell:
+                        injury_index[horse_name_cell] = [InjuryRecord(
+                            date=date_cell,
+                            description=description_cell,
+                        )]
+                        last_horse = horse_name_cell
+                
+                # If second cell is empty and first cell looks like a date, it's a continuation
+                elif last_horse and first_cell and ("/" in first_cell or first_cell.isdigit()):
+                    cont_description = normalize_text(cells[2])
+                    
+                    if cont_description:
+                        injury_index[last_horse].append(InjuryRecord(
+                            date=first_cell,
+                            description=cont_description,
+                        ))
+                
+                else:
+                    # Next row is for a different horse, stop
+                    last_horse = None
+                    
+            except Exception as e:
+                self.logger.debug(f"Error parsing injury row: {e}")
+                last_horse = None
+                continue
+        
+        return injury_index
+    
+    def _resolve_columns(self, header_mapping, field_aliases):
+        """Map each field to the column of its first matching header, or -1."""
+        return tuple(
+            (field, next((header_mapping[h] for h in aliases if h in header_mapping), -1))
+            for field, aliases in field_aliases
+        )
+    
+    def _row_values(self, cells, columns):
+        """Read field values from a row using pre-resolved column indices."""
+        return {
+            field: normalize_text(cells[idx]) if 0 <= idx < len(cells) else ""
+            for field, idx in columns
+        }
+    
+    def _alias_values(self, row_data, field_aliases):
+        """Read each field from the first of its header aliases present in a row dict."""
+        return {
+            field: next((row_data[h] for h in aliases if h in row_data), "")
+            for field, aliases in field_aliases
+        }
+    
+    async def _extract_horse_name_from_page(self, page: Page) -> Optional[str]:
         """Extract horse name from the current page."""
         try:
             # Look for horse name in various places on the page
-            selectors = [
-                "h1",
-                ".horse-name",
-                ".title",
-                "title"
-            ]
-            
-            for selector in selectors:
+            for selector in _HORSE_NAME_SELECTORS:
                 try:
-                    element = page.query_selector(selector)
+                    element = await page.query_selector(selector)
                     if element:
-                        text = normalize_text(extract_text_safe(element))
+                        text = await extract_text_safe(element)
                         if text and len(text) < 20:  # Reasonable horse name length
                             return text
                 except Exception:
                     continue
             
             # Also try to extract from page title
-            title = page.title()
+            title = await page.title()
             if title and "馬匹資料" in title:
                 # Extract horse name from title like "友得盈 - 馬匹資料"
-                parts = title.split(" - ")
-                if len(parts) > 0:
-                    return parts[0].strip()
+                return _horse_name_from_title(title)
             
         except Exception as e:
             self.logger.debug(f"Error extracting horse name: {e}")
         
         return None
     
-    def _scrape_injuries(self, page: Page) -> List[InjuryRecord]:
+    async def _scrape_injuries(
+        self, page: Page, selector_helper: Optional[SelectorHelper] = None
+    ) -> List[InjuryRecord]:
         """Scrape injury/health records from the injuries tab."""
-        selector_helper = SelectorHelper(page, self.logger)
+        selector_helper = selector_helper or SelectorHelper(page, self.logger)
         
         try:
             # Find and click injuries tab
-            injuries_tab = selector_helper.find_tab_by_text(DETAIL_TABS["injuries"])
+            injuries_tab = await selector_helper.find_tab_by_text(DETAIL_TABS["injuries"])
             if not injuries_tab:
                 self.logger.debug("No injuries tab found")
                 return []
             
             # Click tab and wait for content
-            if not selector_helper.click_tab_safe(injuries_tab):
+            if not await selector_helper.click_tab_safe(injuries_tab):
                 return []
             
-            selector_helper.wait_for_tab_content()
-            random_delay()
+            await selector_helper.wait_for_tab_content()
+            await random_delay()
             
             # Find injuries table
-            table = selector_helper.find_table_in_content()
+            table = await selector_helper.find_table_in_content()
             if not table:
                 self.logger.debug("No injuries table found")
                 return []
             
             # Extract injuries data
-            injuries_data = selector_helper.extract_table_data(table)
+            injuries_data = await selector_helper.extract_table_data(table)
             injuries = []
             
             for row_data in injuries_data:
                 try:
                     # Map common field names to our schema
-                    date = row_data.get("日期", row_data.get("Date", ""))
-                    description = row_data.get("描述", row_data.get("Description", row_data.get("傷病", "")))
+                    injury = InjuryRecord(**self._alias_values(row_data, _TAB_INJURY_FIELD_ALIASES))
                     
-                    if date or description:  # Only add if we have some data
-                        injuries.append(InjuryRecord(
-                            date=date,
-                            description=description
-                        ))
+                    if injury.date or injury.description:  # Only add if we have some data
+                        injuries.append(injury)
                 except Exception as e:
                     self.logger.debug(f"Error parsing injury record: {e}")
                     continue
@@ -614,50 +1013,40 @@ class HorseDetailScraper:
             self.logger.error(f"Error scraping injuries: {e}")
             return []
     
-    def _scrape_past_runs(self, page: Page) -> List[PastRunRecord]:
+    async def _scrape_past_runs(
+        self, page: Page, selector_helper: Optional[SelectorHelper] = None
+    ) -> List[PastRunRecord]:
         """Scrape past performance records from the past runs tab."""
-        selector_helper = SelectorHelper(page, self.logger)
+        selector_helper = selector_helper or SelectorHelper(page, self.logger)
         
         try:
             # Find and click past runs tab
-            past_runs_tab = selector_helper.find_tab_by_text(DETAIL_TABS["past_runs"])
+            past_runs_tab = await selector_helper.find_tab_by_text(DETAIL_TABS["past_runs"])
             if not past_runs_tab:
                 self.logger.debug("No past runs tab found")
                 return []
             
             # Click tab and wait for content
-            if not selector_helper.click_tab_safe(past_runs_tab):
+            if not await selector_helper.click_tab_safe(past_runs_tab):
                 return []
             
-            selector_helper.wait_for_tab_content()
-            random_delay()
+            await selector_helper.wait_for_tab_content()
+            await random_delay()
             
             # Find past runs table
-            table = selector_helper.find_table_in_content()
+            table = await selector_helper.find_table_in_content()
             if not table:
                 self.logger.debug("No past runs table found")
                 return []
             
             # Extract past runs data (limit to last 6 races)
-            past_runs_data = selector_helper.extract_table_data(table, max_rows=6)
+            past_runs_data = await selector_helper.extract_table_data(table, max_rows=6)
             past_runs = []
             
             for row_data in past_runs_data:
                 try:
                     # Map common field names to our schema
-                    past_run = PastRunRecord(
-                        race_date=row_data.get("賽事日期", row_data.get("Date", "")),
-                        venue=row_data.get("場地", row_data.get("Venue", "")),
-                        distance=row_data.get("途程", row_data.get("Distance", "")),
-                        barrier=row_data.get("檔位", row_data.get("Barrier", "")),
-                        weight=row_data.get("負磅", row_data.get("Weight", "")),
-                        jockey=row_data.get("騎師", row_data.get("Jockey", "")),
-                        position=row_data.get("名次", row_data.get("Position", "")),
-                        time=row_data.get("時間", row_data.get("Time", "")),
-                        equipment=row_data.get("配備", row_data.get("Equipment", "")),
-                        rating=row_data.get("評分", row_data.get("Rating", "")),
-                        odds=row_data.get("獨贏", row_data.get("Odds", "")),
-                    )
+                    past_run = PastRunRecord(**self._alias_values(row_data, _TAB_PAST_RUN_FIELD_ALIASES))
                     
                     # Only add if we have meaningful data
                     if any([past_run.race_date, past_run.venue, past_run.position]):
@@ -674,53 +1063,37 @@ class HorseDetailScraper:
             self.logger.error(f"Error scraping past runs: {e}")
             return []
     
-    def _scrape_profile(self, page: Page) -> str:
+    async def _scrape_profile(
+        self, page: Page, selector_helper: Optional[SelectorHelper] = None
+    ) -> str:
         """Scrape horse profile/basic information."""
-        selector_helper = SelectorHelper(page, self.logger)
+        selector_helper = selector_helper or SelectorHelper(page, self.logger)
         
         try:
             # Find and click profile tab
-            profile_tab = selector_helper.find_tab_by_text(DETAIL_TABS["profile"])
+            profile_tab = await selector_helper.find_tab_by_text(DETAIL_TABS["profile"])
             if not profile_tab:
                 self.logger.debug("No profile tab found")
                 return ""
             
             # Click tab and wait for content
-            if not selector_helper.click_tab_safe(profile_tab):
+            if not await selector_helper.click_tab_safe(profile_tab):
                 return ""
             
-            selector_helper.wait_for_tab_content()
-            random_delay()
-            
-            # Find profile content
-            profile_content = None
-            content_selectors = [
-                ".profile",
-                ".basicInfo", 
-                ".horseInfo",
-                ".tabContent",
-                ".content"
-            ]
-            
-            for selector in content_selectors:
-                try:
-                    profile_content = page.query_selector(selector)
-                    if profile_content:
-                        break
-                except Exception:
-                    continue
+            await selector_helper.wait_for_tab_content()
+            await random_delay()
             
-            if not profile_content:
+            # Find profile content and extract its text in one round trip
+            profile_text = await page.evaluate(
+                _FIRST_MATCH_TEXT_JS, list(_PROFILE_CONTENT_SELECTORS)
+            )
+            if profile_text is None:
                 self.logger.debug("No profile content found")
                 return ""
             
-            # Extract profile text
-            profile_text = profile_content.inner_text()
             if profile_text:
-                # Clean up the text
-                import re
-                profile_text = re.sub(r'\s+', ' ', profile_text)  # Normalize whitespace
-                profile_text = profile_text.strip()
+                # Clean up the text: collapse whitespace runs and strip the ends
+                profile_text = " ".join(profile_text.split())
                 
                 self.logger.debug(f"Extracted profile text: {len(profile_text)} characters")
                 return profile_text
@@ -1,22 +1,24 @@
 """Main CLI entrypoint for HKJC scraper."""
 
+import asyncio
+import logging
 import sys
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Optional
+from typing import Any, ContextManager, Dict, Iterable, List, Optional
 
 import click
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
+from playwright.async_api import Browser, Playwright, async_playwright
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from .constants import get_config
-from .horse_detail import HorseDetailScraper
+from .constants import BROWSER_LAUNCH_ARGS, MAX_RACES_PER_MEETING, get_config
+from .horse_detail import HorseDetailScraper, InjuryIndex
 from .models import HorseRecord, ToplineData
 from .racecard import RaceCardScraper
 from .utils import (
     load_checkpoint,
-    random_delay,
     save_checkpoint,
     save_final_output,
     setup_logging,
@@ -45,14 +47,18 @@ console = Console()
 )
 @click.option(
     "--raceno",
-    required=True,
     type=int,
     help="Race number (1-12)"
 )
+@click.option(
+    "--all-races",
+    is_flag=True,
+    help="Scrape every race of the meeting concurrently instead of --raceno"
+)
 @click.option(
     "--out",
     required=True,
-    help="Output JSON file path"
+    help="Output JSON file path; with --all-races, {raceno} is replaced per race"
 )
 @click.option(
     "--checkpoint",
@@ -78,7 +84,8 @@ console = Console()
 def main(
     date: str,
     course: str,
-    raceno: int,
+    raceno: Optional[int],
+    all_races: bool,
     out: str,
     checkpoint: Optional[str],
     headful: bool,
@@ -91,6 +98,7 @@ def main(
     
     Example:
         python -m hkjc_scraper --date 2025/09/17 --course HV --raceno 1 --out hv_r1.json
+        python -m hkjc_scraper --date 2025/09/17 --course HV --all-races --out hv_r{raceno}.json
     """
     
     # Setup logging
@@ -105,14 +113,13 @@ def main(
         console.print("[red]Error: Invalid course. Use HV or ST[/red]")
         sys.exit(1)
     
-    if not validate_race_number(raceno):
-        console.print("[red]Error: Invalid race number. Use 1-12[/red]")
-        sys.exit(1)
+    if all_races:
+        _scrape_all_races(date, course, out, checkpoint, headful, max_retries, logger)
+        return
     
-    # Get configuration
-    config = get_config()
-    config["headless"] = not headful
-    config["max_retries"] = max_retries
+    if raceno is None or not validate_race_number(raceno):
+        console.print("[red]Error: Invalid race number. Use 1-12 or --all-races[/red]")
+        sys.exit(1)
     
     console.print(f"[green]Starting HKJC scraper for {date} {course} Race {raceno}[/green]")
     console.print(f"[blue]Output: {out}[/blue]")
@@ -120,101 +127,26 @@ def main(
         console.print(f"[blue]Checkpoint: {checkpoint}[/blue]")
     
     try:
-        # Load checkpoint if provided
-        horses = []
-        if checkpoint and Path(checkpoint).exists():
-            horses = load_checkpoint(checkpoint, logger)
-            console.print(f"[yellow]Loaded checkpoint with {len(horses)} horses[/yellow]")
+        horses = run(
+            date,
+            course,
+            raceno,
+            checkpoint=checkpoint,
+            headless=not headful,
+            max_retries=max_retries,
+            logger=logger,
+        )
+        
+        # Save final output
+        console.print("[blue]Saving final output...[/blue]")
+        save_final_output(horses, out, logger)
+        
+        console.print(f"[green]Successfully scraped {len(horses)} horses![/green]")
+        console.print(f"[green]Output saved to: {out}[/green]")
         
-        # Run scraper
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=config["headless"],
-                args=["--no-sandbox", "--disable-dev-shm-usage"]
-            )
-            
-            try:
-                # Initialize scrapers
-                race_scraper = RaceCardScraper(browser, logger)
-                detail_scraper = HorseDetailScraper(browser, logger)
-                
-                # Scrape race card if no checkpoint
-                if not horses:
-                    console.print("[blue]Scraping race card...[/blue]")
-                    topline_data = race_scraper.scrape_race(date, course, raceno)
-                    console.print(f"[green]Found {len(topline_data)} horses in race[/green]")
-                else:
-                    # Convert existing horses back to topline data for detail scraping
-                    topline_data = []
-                    for horse in horses:
-                        topline_dict = horse.model_dump()
-                        topline_dict["detail_url"] = None  # Will be re-extracted
-                        topline_data.append(ToplineData(**topline_dict))
-                
-                # Scrape horse details
-                if topline_data:
-                    console.print("[blue]Scraping horse details...[/blue]")
-                    
-                    with Progress(
-                        SpinnerColumn(),
-                        TextColumn("[progress.description]{task.description}"),
-                        console=console,
-                    ) as progress:
-                        task = progress.add_task("Scraping horses...", total=len(topline_data))
-                        
-                        for i, horse_data in enumerate(topline_data):
-                            try:
-                                # Skip if we already have detail data (from checkpoint)
-                                if (checkpoint and i < len(horses) and 
-                                    horses[i].傷病記錄 and horses[i].往績紀錄):
-                                    progress.update(task, advance=1)
-                                    continue
-                                
-                                # Scrape details if we have a detail URL
-                                if horse_data.detail_url:
-                                    details = detail_scraper.scrape_horse_details(horse_data.detail_url)
-                                    
-                                    # Merge topline and detail data
-                                    merged_data = horse_data.model_dump()
-                                    merged_data.update(details)
-                                    
-                                    # Create final horse record
-                                    horse_record = HorseRecord(**merged_data)
-                                    
-                                    # Update or add to horses list
-                                    if i < len(horses):
-                                        horses[i] = horse_record
-                                    else:
-                                        horses.append(horse_record)
-                                    
-                                    logger.info(f"Completed horse {i+1}/{len(topline_data)}: {horse_record.馬名}")
-                                
-                                # Save checkpoint every N horses
-                                if checkpoint and (i + 1) % config["checkpoint_interval"] == 0:
-                                    save_checkpoint(horses, checkpoint, logger)
-                                
-                                progress.update(task, advance=1)
-                                random_delay()
-                                
-                            except Exception as e:
-                                logger.error(f"Error scraping horse {i+1}: {e}")
-                                progress.update(task, advance=1)
-                                continue
-                
-                # Save final output
-                console.print("[blue]Saving final output...[/blue]")
-                save_final_output(horses, out, logger)
-                
-                console.print(f"[green]Successfully scraped {len(horses)} horses![/green]")
-                console.print(f"[green]Output saved to: {out}[/green]")
-                
-            finally:
-                browser.close()
-                
     except KeyboardInterrupt:
         console.print("\n[yellow]Scraping interrupted by user[/yellow]")
         if checkpoint:
-            save_checkpoint(horses, checkpoint, logger)
             console.print(f"[yellow]Progress saved to checkpoint: {checkpoint}[/yellow]")
         sys.exit(1)
         
@@ -222,10 +154,371 @@ def main(
         logger.error(f"Fatal error: {e}")
         console.print(f"[red]Fatal error: {e}[/red]")
         if checkpoint:
-            save_checkpoint(horses, checkpoint, logger)
             console.print(f"[yellow]Progress saved to checkpoint: {checkpoint}[/yellow]")
         sys.exit(1)
 
 
+def _scrape_all_races(
+    date: str,
+    course: str,
+    out: str,
+    checkpoint: Optional[str],
+    headful: bool,
+    max_retries: int,
+    logger: logging.Logger,
+) -> None:
+    """Scrape every race of a meeting and save one output file per race."""
+    console.print(f"[green]Starting HKJC scraper for {date} {course}, all races[/green]")
+    
+    try:
+        races = asyncio.run(run_all_async(
+            date,
+            course,
+            range(1, MAX_RACES_PER_MEETING + 1),
+            checkpoint=checkpoint,
+            headless=not headful,
+            max_retries=max_retries,
+            logger=logger,
+        ))
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Scraping interrupted by user[/yellow]")
+        sys.exit(1)
+    
+    # Race numbers past the last race of the meeting have no race card rows
+    races = {raceno: horses for raceno, horses in races.items() if horses}
+    if not races:
+        console.print("[red]No races scraped[/red]")
+        sys.exit(1)
+    
+    console.print("[blue]Saving final output...[/blue]")
+    for raceno, horses in sorted(races.items()):
+        race_out = _race_file_path(out, raceno)
+        save_final_output(horses, race_out, logger)
+        console.print(f"[green]Race {raceno}: {len(horses)} horses -> {race_out}[/green]")
+
+
+def _race_file_path(path: str, raceno: int) -> str:
+    """Return the per-race file path for ``path``.
+    
+    ``{raceno}`` in the path is replaced by the race number; otherwise
+    ``_r<raceno>`` is added before the suffix (``out.json`` -> ``out_r3.json``).
+    """
+    if "{raceno}" in path:
+        return path.replace("{raceno}", str(raceno))
+    
+    file_path = Path(path)
+    return str(file_path.with_name(f"{file_path.stem}_r{raceno}{file_path.suffix}"))
+
+
+def run(
+    date: str,
+    course: str,
+    raceno: int,
+    checkpoint: Optional[str] = None,
+    headless: bool = True,
+    max_retries: int = 3,
+    logger: Optional[logging.Logger] = None,
+) -> List[HorseRecord]:
+    """Scrape a race in-process and return the horse records.
+    
+    Blocking wrapper around ``run_async`` for callers without an event loop.
+    """
+    return asyncio.run(run_async(
+        date,
+        course,
+        raceno,
+        checkpoint=checkpoint,
+        headless=headless,
+        max_retries=max_retries,
+        logger=logger,
+    ))
+
+
+async def run_async(
+    date: str,
+    course: str,
+    raceno: int,
+    checkpoint: Optional[str] = None,
+    headless: bool = True,
+    max_retries: int = 3,
+    logger: Optional[logging.Logger] = None,
+    browser: Optional[Browser] = None,
+    progress: Optional[Progress] = None,
+    injury_index: Optional[InjuryIndex] = None,
+) -> List[HorseRecord]:
+    """Scrape a race in-process and return the horse records.
+    
+    This is the programmatic entrypoint used by the CLI and the Flask app.
+    Inputs are assumed to be validated by the caller. On failure the
+    checkpoint (if any) is saved before the exception is re-raised.
+    
+    Pass an already-launched ``browser`` to reuse it across calls; it is
+    left open and must belong to the running event loop. Otherwise a
+    browser is launched and closed for this call.
+    
+    Pass a started ``progress`` to show this race as a task on it instead of
+    a progress display of its own, and an ``injury_index`` shared with other
+    races of the meeting to load the veterinary database only once.
+    """
+    if logger is None:
+        logger = setup_logging()
+    
+    # Get configuration
+    config = dict(get_config())
+    config["headless"] = headless
+    config["max_retries"] = max_retries
+    
+    horses = []
+    try:
+        # Load checkpoint if provided
+        if checkpoint and Path(checkpoint).exists():
+            horses = load_checkpoint(checkpoint, logger)
+            console.print(f"[yellow]Loaded checkpoint with {len(horses)} horses[/yellow]")
+        
+        if browser is not None:
+            return await _scrape_race(
+                browser, date, course, raceno, horses, checkpoint, config, logger,
+                progress, injury_index,
+            )
+        
+        # Run scraper on a browser owned by this call
+        async with async_playwright() as p:
+            own_browser = await launch_browser(p, config["headless"])
+            try:
+                return await _scrape_race(
+                    own_browser, date, course, raceno, horses, checkpoint, config, logger,
+                    progress, injury_index,
+                )
+            finally:
+                await own_browser.close()
+                
+    except BaseException:
+        if checkpoint:
+            save_checkpoint(horses, checkpoint, logger)
+        raise
+
+
+async def run_all_async(
+    date: str,
+    course: str,
+    racenos: Iterable[int],
+    checkpoint: Optional[str] = None,
+    headless: bool = True,
+    max_retries: int = 3,
+    logger: Optional[logging.Logger] = None,
+    browser: Optional[Browser] = None,
+) -> Dict[int, List[HorseRecord]]:
+    """Scrape several races of a meeting concurrently on one browser.
+    
+    Each race goes through ``run_async`` with its own browser contexts;
+    ``checkpoint`` is expanded per race with ``_race_file_path``. At most
+    ``config["race_concurrency"]`` races run at once, every race is a task on
+    one shared progress display, and the veterinary database is scraped once
+    for the meeting. Returns the horse records by race number. A race that
+    fails is logged and left out.
+    """
+    if logger is None:
+        logger = setup_logging()
+    
+    racenos = list(racenos)
+    
+    # Each running race holds a race card context and up to
+    # config["concurrency"] detail pages, so the races in flight are capped
+    race_slots = asyncio.Semaphore(get_config()["race_concurrency"])
+    injury_index = InjuryIndex()
+    
+    async def _scrape_one(
+        shared_browser: Browser, raceno: int, progress: Progress
+    ) -> List[HorseRecord]:
+        async with race_slots:
+            return await run_async(
+                date,
+                course,
+                raceno,
+                checkpoint=_race_file_path(checkpoint, raceno) if checkpoint else None,
+                headless=headless,
+                max_retries=max_retries,
+                logger=logger,
+                browser=shared_browser,
+                progress=progress,
+                injury_index=injury_index,
+            )
+    
+    async def _scrape_all(shared_browser: Browser) -> Dict[int, List[HorseRecord]]:
+        # One live display for all races; rich allows a single Live at a time
+        # per console, and races finish in any order
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            results = await asyncio.gather(
+                *(_scrape_one(shared_browser, raceno, progress) for raceno in racenos),
+                return_exceptions=True,
+            )
+        
+        races = {}
+        for raceno, result in zip(racenos, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                logger.error(f"Error scraping race {raceno}: {result}")
+            else:
+                races[raceno] = result
+        return races
+    
+    if browser is not None:
+        return await _scrape_all(browser)
+    
+    # One browser owned by this call, shared by every race
+    async with async_playwright() as p:
+        own_browser = await launch_browser(p, headless)
+        try:
+            return await _scrape_all(own_browser)
+        finally:
+            await own_browser.close()
+
+
+async def launch_browser(playwright: Playwright, headless: bool = True) -> Browser:
+    """Launch the Chromium browser used for scraping."""
+    return await playwright.chromium.launch(
+        headless=headless,
+        args=BROWSER_LAUNCH_ARGS,
+    )
+
+
+async def _scrape_race(
+    browser: Browser,
+    date: str,
+    course: str,
+    raceno: int,
+    horses: List[HorseRecord],
+    checkpoint: Optional[str],
+    config: Dict[str, Any],
+    logger: logging.Logger,
+    progress: Optional[Progress] = None,
+    injury_index: Optional[InjuryIndex] = None,
+) -> List[HorseRecord]:
+    """Scrape the race card and horse details into ``horses`` in place.
+    
+    Progress is shown as a task on ``progress`` when given, otherwise on a
+    progress display opened for this race. Injury records are looked up in
+    ``injury_index`` when given.
+    """
+    # Initialize scrapers
+    race_scraper = RaceCardScraper(browser, logger)
+    detail_scraper = HorseDetailScraper(browser, logger, injury_index)
+    
+    # Background checkpoint write and the newest horse list waiting for it
+    checkpoint_writer: Optional[asyncio.Task] = None
+    latest_snapshot: Optional[List[Dict[str, Any]]] = None
+    
+    try:
+        # Scrape race card if no checkpoint
+        if not horses:
+            console.print("[blue]Scraping race card...[/blue]")
+            topline_data = await race_scraper.scrape_race(date, course, raceno)
+            console.print(f"[green]Found {len(topline_data)} horses in race[/green]")
+        else:
+            # Convert existing horses back to topline data for detail scraping;
+            # checkpointed records are already validated, so skip revalidation
+            topline_data = [
+                ToplineData.model_construct(**horse.__dict__, detail_url=None)  # Will be re-extracted
+                for horse in horses
+            ]
+        
+        # Scrape horse details
+        if topline_data:
+            console.print("[blue]Scraping horse details...[/blue]")
+            
+            # Slot per race card row; horses without a record are dropped
+            records: List[Optional[HorseRecord]] = [
+                horses[i] if i < len(horses) else None
+                for i in range(len(topline_data))
+            ]
+            
+            # model_dump of each record, taken once; records are not changed
+            # after they are built, so checkpoints only re-encode the dicts
+            dumped: List[Optional[Dict[str, Any]]] = [
+                record.model_dump() if checkpoint and record is not None else None
+                for record in records
+            ]
+            
+            # Skip horses we already have detail data for (from checkpoint)
+            pending = [
+                i for i, horse_data in enumerate(topline_data)
+                if horse_data.detail_url and not (
+                    checkpoint and i < len(horses) and
+                    horses[i].傷病記錄 and horses[i].往績紀錄
+                )
+            ]
+            
+            display: ContextManager[Progress]
+            if progress is None:
+                display = Progress(
+                    SpinnerColumn(),
+                    TextColumn("[progress.description]{task.description}"),
+                    console=console,
+                )
+                description = "Scraping horses..."
+            else:
+                display = nullcontext(progress)
+                description = f"Race {raceno}: scraping horses..."
+            
+            with display as progress:
+                task = progress.add_task(description, total=len(topline_data))
+                progress.update(task, advance=len(topline_data) - len(pending))
+                completed = 0
+                
+                async def write_checkpoints() -> None:
+                    # Write off the event loop; snapshots queued meanwhile
+                    # coalesce into the latest one
+                    nonlocal latest_snapshot
+                    while latest_snapshot is not None:
+                        snapshot, latest_snapshot = latest_snapshot, None
+                        await asyncio.to_thread(save_checkpoint, snapshot, checkpoint, logger)
+                
+                def on_result(n: int, details: Optional[Dict[str, Any]]) -> None:
+                    nonlocal completed, latest_snapshot, checkpoint_writer
+                    i = pending[n]
+                    
+                    if details is not None:
+                        try:
+                            # Merge topline and detail data; both were validated
+                            # when scraped, so build the record without a dump
+                            merged_data = {**topline_data[i].__dict__, **details}
+                            
+                            # Create final horse record
+                            records[i] = HorseRecord.model_construct(**merged_data)
+                            if checkpoint:
+                                dumped[i] = records[i].model_dump()
+                            logger.info(f"Completed horse {i+1}/{len(topline_data)}: {records[i].馬名}")
+                        except Exception as e:
+                            logger.error(f"Error scraping horse {i+1}: {e}")
+                    
+                    horses[:] = [record for record in records if record is not None]
+                    completed += 1
+                    
+                    # Save checkpoint every N horses in the background
+                    if checkpoint and completed % config["checkpoint_interval"] == 0:
+                        latest_snapshot = [data for data in dumped if data is not None]
+                        if checkpoint_writer is None or checkpoint_writer.done():
+                            checkpoint_writer = asyncio.create_task(write_checkpoints())
+                    
+                    progress.update(task, advance=1)
+                
+                await detail_scraper.scrape_many(
+                    [topline_data[i].detail_url for i in pending],
+                    on_result,
+                )
+        
+        return horses
+        
+    finally:
+        if checkpoint_writer is not None:
+            await asyncio.gather(checkpoint_writer, return_exceptions=True)
+        await detail_scraper.close()
+
+
 if __name__ == "__main__":
     main()
@@ -1,44 +1,57 @@
-"""Pydantic models for horse data schema validation."""
+"""Pydantic models and record dataclasses for horse data schema validation."""
 
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
-class InjuryRecord(BaseModel):
-    """Model for injury/health records."""
+def _blank_none_values(data: Any) -> Any:
+    """Replace None values in raw model input with empty strings."""
+    if isinstance(data, dict) and None in data.values():
+        return {key: "" if value is None else value for key, value in data.items()}
+    return data
+
+
+@dataclass(slots=True)
+class InjuryRecord:
+    """Record for injury/health records."""
     
-    date: str = Field(default="", description="Injury date")
-    description: str = Field(default="", description="Injury description")
+    date: str = ""  # Injury date
+    description: str = ""  # Injury description
 
 
-class PastRunRecord(BaseModel):
-    """Model for past performance records."""
+@dataclass(slots=True)
+class PastRunRecord:
+    """Record for past performance records."""
     
-    race_date: str = Field(default="", description="Race date")
-    venue: str = Field(default="", description="Race venue")
-    distance: str = Field(default="", description="Race distance")
-    barrier: str = Field(default="", description="Barrier position")
-    weight: str = Field(default="", description="Carried weight")
-    jockey: str = Field(default="", description="Jockey name")
-    position: str = Field(default="", description="Finishing position")
-    time: str = Field(default="", description="Race time")
-    equipment: str = Field(default="", description="Equipment used")
-    rating: str = Field(default="", description="Rating")
-    odds: str = Field(default="", description="Win odds")
+    race_date: str = ""  # Race date
+    venue: str = ""  # Race venue
+    distance: str = ""  # Race distance
+    barrier: str = ""  # Barrier position
+    weight: str = ""  # Carried weight
+    jockey: str = ""  # Jockey name
+    position: str = ""  # Finishing position
+    time: str = ""  # Race time
+    equipment: str = ""  # Equipment used
+    rating: str = ""  # Rating
+    odds: str = ""  # Win odds
     
     # Additional comprehensive fields
-    track_condition: str = Field(default="", description="Track condition")
-    race_class: str = Field(default="", description="Race class")
-    distance_to_winner: str = Field(default="", description="Distance to winner")
-    running_position: str = Field(default="", description="Running position during race")
-    barrier_weight: str = Field(default="", description="Barrier weight")
-    trainer: str = Field(default="", description="Trainer name")
+    track_condition: str = ""  # Track condition
+    race_class: str = ""  # Race class
+    distance_to_winner: str = ""  # Distance to winner
+    running_position: str = ""  # Running position during race
+    barrier_weight: str = ""  # Barrier weight
+    trainer: str = ""  # Trainer name
 
 
 class ToplineData(BaseModel):
     """Model for top-line race data from the main table."""
     
+    # Numbers scraped or loaded as int/float are stored as strings
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+    
     馬號: str = Field(default="", description="Horse number")
     馬匹ID: str = Field(default="", description="Horse ID")
     馬名: str = Field(default="", description="Horse name")
@@ -65,15 +78,11 @@ class ToplineData(BaseModel):
     # Additional fields for internal use
     detail_url: Optional[str] = Field(default=None, description="Horse detail page URL")
     
-    @field_validator("*", mode="before")
+    @model_validator(mode="before")
     @classmethod
-    def convert_to_string(cls, v: Any) -> str:
-        """Convert all values to strings except lists and None."""
-        if v is None:
-            return ""
-        if isinstance(v, (list, dict)):
-            return v
-        return str(v)
+    def convert_none_to_empty(cls, data: Any) -> Any:
+        """Convert None values to empty strings in one pass over the input."""
+        return _blank_none_values(data)
     
     @classmethod
     def from_topline_and_detail(
@@ -90,6 +99,9 @@ class ToplineData(BaseModel):
 class HorseRecord(BaseModel):
     """Final horse record model matching the exact output schema."""
     
+    # Numbers scraped or loaded as int/float are stored as strings
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+    
     馬號: str = Field(default="", description="Horse number")
     馬匹ID: str = Field(default="", description="Horse ID")
     馬名: str = Field(default="", description="Horse name")
@@ -111,15 +123,11 @@ class HorseRecord(BaseModel):
     往績紀錄: List[PastRunRecord] = Field(default_factory=list, description="Past performance records")
     馬匹基本資料: str = Field(default="", description="Horse basic information")
     
-    @field_validator("*", mode="before")
+    @model_validator(mode="before")
     @classmethod
-    def convert_to_string(cls, v: Any) -> str:
-        """Convert all values to strings except lists and None."""
-        if v is None:
-            return ""
-        if isinstance(v, (list, dict)):
-            return v
-        return str(v)
+    def convert_none_to_empty(cls, data: Any) -> Any:
+        """Convert None values to empty strings in one pass over the input."""
+        return _blank_none_values(data)
     
     @classmethod
     def from_topline_data(cls, topline_data: ToplineData) -> "HorseRecord":
@@ -2,20 +2,49 @@
 
 from typing import Dict, List, Optional, Tuple
 
-from playwright.sync_api import Browser, Page
+from playwright.async_api import Browser, Page
 
 from .constants import EXPECTED_HEADERS, get_config
 from .models import ToplineData
 from .selectors import SelectorHelper
 from .utils import (
+    block_unneeded_resources,
     build_racecard_url,
-    extract_href_safe,
+    normalize_text,
+    parse_horse_id,
     random_delay,
     retry_with_backoff,
     setup_logging,
     wait_for_selector_safe,
 )
 
+# Cell texts and horse link hrefs of every row after the header, read in one round trip
+_ROWS_JS = """(table) => Array.from(table.querySelectorAll('tr')).slice(1).map(row => ({
+    cells: Array.from(row.querySelectorAll('td, th')).map(cell => cell.innerText),
+    hrefs: Array.from(row.querySelectorAll("a[href*='Horse.aspx'], a[href*='horse']"))
+        .map(link => link.getAttribute('href')),
+}))"""
+
+# Actual table headers and the schema fields they map to
+_FIELD_MAPPING = (
+    ("編號", "馬號"),  # Number -> Horse number
+    ("馬名", "馬名"),  # Horse name
+    ("排位體重", "排位"),  # Barrier weight -> Barrier position
+    ("負磅", "負磅"),  # Carried weight
+    ("評分", "當前評分"),  # Rating -> Current rating
+    ("馬齡", "馬齡"),  # Age (new field)
+    ("6次近績", "最近6輪"),  # Recent 6 runs
+    ("練馬師", "練馬師"),  # Trainer
+    ("優先參賽次序", "練馬師喜好"),  # Priority -> Trainer preference
+    ("配備", "配備"),  # Equipment
+    ("騎師", "騎師"),  # Jockey
+    ("讓磅", "讓磅"),  # Weight allowance
+    ("獨贏", "獨贏"),  # Win odds
+    ("位置", "位置"),  # Place odds
+    ("馬匹編號", "馬匹編號"),  # Horse code
+    ("國際評分", "國際評分"),  # International rating
+)
+
 
 class RaceCardScraper:
     """Scraper for race card pages."""
@@ -25,7 +54,7 @@ class RaceCardScraper:
         self.logger = logger or setup_logging()
         self.config = get_config()
     
-    def scrape_race(
+    async def scrape_race(
         self, 
         date: str, 
         course: str, 
@@ -35,41 +64,47 @@ class RaceCardScraper:
         url = build_racecard_url(date, course, raceno)
         self.logger.info(f"Scraping race card: {url}")
         
-        def _scrape():
-            page = self.browser.new_page()
+        async def _scrape():
+            # User agent and request blocking are set once on the context
+            context = await self.browser.new_context(user_agent=self.config["user_agent"])
             try:
-                # Set user agent
-                page.set_extra_http_headers({
-                    "User-Agent": self.config["user_agent"]
-                })
+                if self.config["block_resources"]:
+                    await context.route("**/*", block_unneeded_resources)
+                page = await context.new_page()
                 
                 # Navigate to race card page
-                page.goto(url, timeout=self.config["page_load_timeout"])
+                await page.goto(
+                    url,
+                    wait_until="domcontentloaded",
+                    timeout=self.config["page_load_timeout"],
+                )
                 
-                # Wait for page to load
-                wait_for_selector_safe(page, "body", self.config["selector_timeout"], self.logger)
-                random_delay()
+                # Wait for the race table to be in the DOM, not the whole page load
+                await wait_for_selector_safe(
+                    page, "table", self.config["selector_timeout"], self.logger, state="attached"
+                )
+                await random_delay()
                 
                 # Find and scrape the race table
-                return self._scrape_race_table(page)
+                return await self._scrape_race_table(page)
                 
             finally:
-                page.close()
+                await context.close()
         
-        return retry_with_backoff(_scrape, logger=self.logger)
+        return await retry_with_backoff(_scrape, logger=self.logger)
     
-    def _scrape_race_table(self, page: Page) -> List[ToplineData]:
+    async def _scrape_race_table(self, page: Page) -> List[ToplineData]:
         """Scrape the main race table."""
         selector_helper = SelectorHelper(page, self.logger)
         
         # Find the race table
-        table = selector_helper.find_table_by_headers(EXPECTED_HEADERS)
+        table = await selector_helper.find_table_by_headers(EXPECTED_HEADERS)
         if not table:
             self.logger.error("Could not find race table with expected headers")
             return []
         
         # Get header to column mapping
-        column_map = selector_helper.get_header_column_map(table, EXPECTED_HEADERS)
+        column_map = await selector_helper.get_header_column_map(table, EXPECTED_HEADERS)
         if not column_map:
             self.logger.error("Could not map table headers to columns")
             return []
@@ -79,11 +114,11 @@ class RaceCardScraper:
         # Extract horse data from table rows
         horses = []
         try:
-            rows = table.query_selector_all("tr")[1:]  # Skip header row
+            rows = await table.evaluate(_ROWS_JS)  # Header row skipped
             
             for row_index, row in enumerate(rows):
                 try:
-                    horse_data = self._extract_horse_data(row, column_map, selector_helper)
+                    horse_data = self._extract_horse_data(row, column_map)
                     if horse_data:
                         horses.append(horse_data)
                         self.logger.debug(f"Extracted horse {row_index + 1}: {horse_data.馬名}")
@@ -99,40 +134,20 @@ class RaceCardScraper:
     
     def _extract_horse_data(
         self, 
-        row, 
-        column_map: Dict[str, int], 
-        selector_helper: SelectorHelper
+        row: Dict[str, List[str]], 
+        column_map: Dict[str, int]
     ) -> Optional[ToplineData]:
-        """Extract horse data from a table row."""
+        """Extract horse data from a table row's cell texts and link hrefs."""
         try:
             # Extract basic fields using column mapping
             horse_data = {}
             
-            # Map actual table headers to our schema fields
-            field_mapping = {
-                "編號": "馬號",           # Number -> Horse number
-                "馬名": "馬名",           # Horse name
-                "排位體重": "排位",        # Barrier weight -> Barrier position  
-                "負磅": "負磅",           # Carried weight
-                "評分": "當前評分",        # Rating -> Current rating
-                "馬齡": "馬齡",           # Age (new field)
-                "6次近績": "最近6輪",      # Recent 6 runs
-                "練馬師": "練馬師",        # Trainer
-                "優先參賽次序": "練馬師喜好", # Priority -> Trainer preference
-                "配備": "配備",           # Equipment
-                "騎師": "騎師",           # Jockey
-                "讓磅": "讓磅",           # Weight allowance
-                "獨贏": "獨贏",           # Win odds
-                "位置": "位置",           # Place odds
-                "馬匹編號": "馬匹編號",    # Horse code
-                "國際評分": "國際評分",    # International rating
-            }
-            
             # Extract fields from table
-            for table_header, schema_field in field_mapping.items():
-                if table_header in column_map:
-                    value = selector_helper.get_cell_by_header(row, table_header, column_map)
-                    horse_data[schema_field] = value
+            cells = row["cells"]
+            for table_header, schema_field in _FIELD_MAPPING:
+                col_index = column_map.get(table_header, len(cells))
+                if col_index < len(cells):
+                    horse_data[schema_field] = normalize_text(cells[col_index])
                 else:
                     horse_data[schema_field] = ""
             
@@ -141,7 +156,7 @@ class RaceCardScraper:
                 horse_data["練馬師喜好"] = "1"
             
             # Find horse detail link
-            detail_url = self._find_horse_detail_link(row)
+            detail_url = self._find_horse_detail_link(row["hrefs"])
             if detail_url:
                 horse_data["detail_url"] = detail_url
                 # Try to extract horse ID from URL
@@ -156,18 +171,17 @@ class RaceCardScraper:
             self.logger.error(f"Error creating horse data object: {e}")
             return None
     
-    def _find_horse_detail_link(self, row) -> Optional[str]:
-        """Find horse detail link in table row."""
+    def _find_horse_detail_link(self, hrefs: List[str]) -> Optional[str]:
+        """Find horse detail link among a table row's horse link hrefs."""
         try:
-            # Look for links in the row
-            links = row.query_selector_all("a")
-            for link in links:
-                href = extract_href_safe(link)
-                if href and ("Horse.aspx" in href or "horse" in href):
-                    # Make absolute URL if needed
-                    if href.startswith("/"):
-                        href = f"https://racing.hkjc.com{href}"
-                    return href
+            # The row script already filtered anchors to horse links
+            if not hrefs:
+                return None
+            href = hrefs[0]
+            # Make absolute URL if needed
+            if href.startswith("/"):
+                href = f"https://racing.hkjc.com{href}"
+            return href
             
         except Exception as e:
             self.logger.debug(f"Error finding horse detail link: {e}")
@@ -177,34 +191,7 @@ class RaceCardScraper:
     def _extract_horse_id_from_url(self, url: str) -> Optional[str]:
         """Extract horse ID from detail URL."""
         try:
-            # Common patterns for horse IDs in URLs
-            import re
-            
-            # Pattern 1: Horse.aspx?HorseId=HK_2024_K106 -> extract K106 (last segment)
-            match = re.search(r'HorseId=([A-Z0-9_]+)', url)
-            if match:
-                full_id = match.group(1)
-                # Extract the last segment after the last underscore
-                parts = full_id.split('_')
-                if len(parts) > 1:
-                    return parts[-1]  # Return just the last part (e.g., K106)
-                return full_id
-            
-            # Pattern 2: Horse.aspx?HorseId=12345 (numeric ID)
-            match = re.search(r'HorseId=(\d+)', url)
-            if match:
-                return match.group(1)
-            
-            # Pattern 3: /horse/12345/
-            match = re.search(r'/horse/(\d+)/', url)
-            if match:
-                return match.group(1)
-            
-            # Pattern 4: horse_id=12345
-            match = re.search(r'horse_id=(\d+)', url)
-            if match:
-                return match.group(1)
-            
+            return parse_horse_id(url)
         except Exception as e:
             self.logger.debug(f"Error extracting horse ID from URL: {e}")
         
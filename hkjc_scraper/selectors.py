@@ -1,13 +1,81 @@
 """Selector utilities for dynamic header mapping and XPath helpers."""
 
 import re
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from playwright.sync_api import ElementHandle, Page
+from playwright.async_api import ElementHandle, Page
 
 from .constants import EXPECTED_HEADERS, SELECTORS
 from .utils import extract_text_safe, normalize_text, setup_logging
 
+# Header cleanup patterns used by _header_matches
+_NON_WORD_RE = re.compile(r"[^\w]")
+_NON_HAN_RE = re.compile(r"[^\u4e00-\u9fff]")
+
+# Cell texts of a table's rows ('td, th' of every tr), header row first;
+# at most maxRows data rows when maxRows is set
+_TABLE_ROWS_JS = """(table, maxRows) => {
+    let rows = Array.from(table.querySelectorAll('tr'));
+    if (maxRows) {
+        rows = rows.slice(0, maxRows + 1);
+    }
+    return rows.map(row => Array.from(row.querySelectorAll('td, th')).map(cell => cell.innerText));
+}"""
+
+# Header cell texts (every th, or the first row's cells when there are none)
+# and the first row's cell texts by column
+_HEADER_TEXTS_JS = """(table) => {
+    const texts = cells => Array.from(cells).map(cell => cell.innerText);
+    const firstRow = table.querySelector('tr');
+    const firstRowTexts = firstRow ? texts(firstRow.querySelectorAll('td, th')) : [];
+    const thTexts = texts(table.querySelectorAll('th'));
+    return {headers: thTexts.length ? thTexts : firstRowTexts, firstRow: firstRowTexts};
+}"""
+
+# [text, href] of the first horse link in each row after the header
+_HORSE_LINKS_JS = """(table) => Array.from(table.querySelectorAll('tr')).slice(1)
+    .map(row => row.querySelector("a[href*='Horse.aspx'], a[href*='horse']"))
+    .filter(link => link)
+    .map(link => [link.innerText, link.getAttribute('href')])"""
+
+
+@lru_cache(maxsize=4096)
+def _header_matches(expected: str, actual: str) -> bool:
+    """Check if header text matches expected (with fuzzy matching)."""
+    # Exact match
+    if expected == actual:
+        return True
+    
+    # Contains match
+    if expected in actual or actual in expected:
+        return True
+    
+    # Remove common variations and normalize
+    expected_clean = _NON_WORD_RE.sub('', expected)
+    actual_clean = _NON_WORD_RE.sub('', actual)
+    
+    if expected_clean == actual_clean:
+        return True
+    
+    # Additional fuzzy matching for Chinese characters
+    # Check if the core characters match (ignoring punctuation)
+    expected_core = _NON_HAN_RE.sub('', expected)
+    actual_core = _NON_HAN_RE.sub('', actual)
+    
+    if expected_core and actual_core:
+        # Check if one contains the other
+        if expected_core in actual_core or actual_core in expected_core:
+            return True
+        
+        # Check for partial matches (at least 2 characters)
+        if len(expected_core) >= 2 and len(actual_core) >= 2:
+            for i in range(len(expected_core) - 1):
+                if expected_core[i:i+2] in actual_core:
+                    return True
+    
+    return False
+
 
 class SelectorHelper:
     """Helper class for finding elements using dynamic selectors."""
@@ -15,8 +83,42 @@ class SelectorHelper:
     def __init__(self, page: Page, logger=None):
         self.page = page
         self.logger = logger or setup_logging()
+        
+        # Tab handles and their texts by tab selector, valid until the page navigates
+        self._tab_cache: Dict[str, List[Tuple[ElementHandle, str]]] = {}
+        
+        # Normalized (header texts, first row texts) by table handle
+        self._header_cache: Dict[ElementHandle, Tuple[List[str], List[str]]] = {}
     
-    def find_table_by_headers(
+    def clear_cache(self) -> None:
+        """Forget cached tab handles and header texts; call after the page navigates."""
+        self._tab_cache.clear()
+        self._header_cache.clear()
+    
+    async def _get_tabs(self, tab_selector: str) -> List[Tuple[ElementHandle, str]]:
+        """Return (tab, text) pairs for a tab selector, querying the page once."""
+        tabs = self._tab_cache.get(tab_selector)
+        if tabs is None:
+            tabs = [
+                (tab, await extract_text_safe(tab))
+                for tab in await self.page.query_selector_all(tab_selector)
+            ]
+            self._tab_cache[tab_selector] = tabs
+        return tabs
+    
+    async def _get_header_texts(self, table: ElementHandle) -> Tuple[List[str], List[str]]:
+        """Return a table's normalized header and first row texts, reading them once."""
+        texts = self._header_cache.get(table)
+        if texts is None:
+            raw = await table.evaluate(_HEADER_TEXTS_JS)
+            texts = (
+                [normalize_text(text) for text in raw["headers"]],
+                [normalize_text(text) for text in raw["firstRow"]],
+            )
+            self._header_cache[table] = texts
+        return texts
+    
+    async def find_table_by_headers(
         self, 
         expected_headers: List[str],
         table_selectors: Optional[List[str]] = None
@@ -25,23 +127,22 @@ class SelectorHelper:
         if table_selectors is None:
             table_selectors = [SELECTORS["race_table"]]
         
-        # First try to find tables with specific selectors
-        for table_selector in table_selectors:
-            try:
-                tables = self.page.query_selector_all(table_selector)
-                for table in tables:
-                    if self._table_has_headers(table, expected_headers):
-                        self.logger.debug(f"Found table with headers: {expected_headers}")
-                        return table
-            except Exception as e:
-                self.logger.debug(f"Error checking table selector '{table_selector}': {e}")
-                continue
+        # First try to find tables with specific selectors, queried together
+        table_selector = ", ".join(table_selectors)
+        try:
+            tables = await self.page.query_selector_all(table_selector)
+            for table in tables:
+                if await self._table_has_headers(table, expected_headers):
+                    self.logger.debug(f"Found table with headers: {expected_headers}")
+                    return table
+        except Exception as e:
+            self.logger.debug(f"Error checking table selector '{table_selector}': {e}")
         
         # If no table found with specific selectors, try all tables on the page
         try:
-            all_tables = self.page.query_selector_all("table")
+            all_tables = await self.page.query_selector_all("table")
             for table in all_tables:
-                if self._table_has_headers(table, expected_headers):
+                if await self._table_has_headers(table, expected_headers):
                     self.logger.debug(f"Found table with headers in generic search: {expected_headers}")
                     return table
         except Exception as e:
@@ -50,37 +151,30 @@ class SelectorHelper:
         self.logger.warning(f"No table found with expected headers: {expected_headers}")
         return None
     
-    def _table_has_headers(self, table: ElementHandle, expected_headers: List[str]) -> bool:
+    async def _table_has_headers(self, table: ElementHandle, expected_headers: List[str]) -> bool:
         """Check if table contains the expected headers."""
         try:
-            # Get all header cells (th elements or first row cells)
-            header_cells = table.query_selector_all("th")
-            if not header_cells:
-                # If no th elements, check first row
-                first_row = table.query_selector("tr")
-                if first_row:
-                    header_cells = first_row.query_selector_all("td, th")
-            
-            if not header_cells:
+            # Get all header cell texts (th elements or first row cells)
+            header_texts = [text for text in (await self._get_header_texts(table))[0] if text]
+            if not header_texts:
                 return False
             
-            # Extract header texts
-            header_texts = []
-            for cell in header_cells:
-                text = normalize_text(extract_text_safe(cell))
-                if text:
-                    header_texts.append(text)
+            # Exact hits first; require at least 3 matching headers to be confident
+            exact_hits = frozenset(header_texts).intersection(expected_headers)
+            found_headers = len(exact_hits)
+            if found_headers >= 3:
+                return True
             
-            # Check if we have at least some of the expected headers
-            found_headers = 0
+            # Fall back to fuzzy matching for the expected headers not hit exactly
             for expected in expected_headers:
-                for header_text in header_texts:
-                    if self._header_matches(expected, header_text):
-                        found_headers += 1
-                        break
+                if expected not in exact_hits and any(
+                    self._header_matches(expected, header_text) for header_text in header_texts
+                ):
+                    found_headers += 1
+                    if found_headers >= 3:
+                        return True
             
-            # Require at least 3 matching headers to be confident
-            return found_headers >= 3
+            return False
             
         except Exception as e:
             self.logger.debug(f"Error checking table headers: {e}")
@@ -88,40 +182,9 @@ class SelectorHelper:
     
     def _header_matches(self, expected: str, actual: str) -> bool:
         """Check if header text matches expected (with fuzzy matching)."""
-        # Exact match
-        if expected == actual:
-            return True
-        
-        # Contains match
-        if expected in actual or actual in expected:
-            return True
-        
-        # Remove common variations and normalize
-        expected_clean = re.sub(r'[^\w]', '', expected)
-        actual_clean = re.sub(r'[^\w]', '', actual)
-        
-        if expected_clean == actual_clean:
-            return True
-        
-        # Additional fuzzy matching for Chinese characters
-        # Check if the core characters match (ignoring punctuation)
-        expected_core = re.sub(r'[^\u4e00-\u9fff]', '', expected)
-        actual_core = re.sub(r'[^\u4e00-\u9fff]', '', actual)
-        
-        if expected_core and actual_core:
-            # Check if one contains the other
-            if expected_core in actual_core or actual_core in expected_core:
-                return True
-            
-            # Check for partial matches (at least 2 characters)
-            if len(expected_core) >= 2 and len(actual_core) >= 2:
-                for i in range(len(expected_core) - 1):
-                    if expected_core[i:i+2] in actual_core:
-                        return True
-        
-        return False
+        return _header_matches(expected, actual)
     
-    def get_header_column_map(
+    async def get_header_column_map(
         self, 
         table: ElementHandle, 
         expected_headers: List[str]
@@ -130,25 +193,39 @@ class SelectorHelper:
         column_map = {}
         
         try:
-            # Get header row
-            header_row = table.query_selector("tr")
-            if not header_row:
-                return column_map
+            # Header row texts were read when the table was matched
+            header_texts = (await self._get_header_texts(table))[1]
             
-            # Get all header cells
-            header_cells = header_row.query_selector_all("td, th")
-            
-            for col_index, cell in enumerate(header_cells):
-                header_text = normalize_text(extract_text_safe(cell))
+            # Exact header texts claim their columns first, so a fuzzy match
+            # such as 國際評分 ~ 評分+/- cannot take a column from its own header
+            expected_set = frozenset(expected_headers)
+            fuzzy_columns = []
+            for col_index, header_text in enumerate(header_texts):
                 if not header_text:
                     continue
+                if header_text in expected_set:
+                    if header_text not in column_map:
+                        column_map[header_text] = col_index
+                        self.logger.debug(f"Mapped header '{header_text}' to column {col_index}")
+                else:
+                    fuzzy_columns.append((col_index, header_text))
+            
+            # A remaining column belongs to the first expected header it
+            # matches; it is skipped when that header already has a column,
+            # so 評分+/- never falls through to 國際評分
+            for col_index, header_text in fuzzy_columns:
+                if len(column_map) == len(expected_set):
+                    break
                 
                 # Find matching expected header
-                for expected in expected_headers:
-                    if self._header_matches(expected, header_text):
-                        column_map[expected] = col_index
-                        self.logger.debug(f"Mapped header '{expected}' to column {col_index}")
-                        break
+                expected = next(
+                    (expected for expected in expected_headers
+                     if self._header_matches(expected, header_text)),
+                    None,
+                )
+                if expected is not None and expected not in column_map:
+                    column_map[expected] = col_index
+                    self.logger.debug(f"Mapped header '{expected}' to column {col_index}")
             
         except Exception as e:
             self.logger.error(f"Error mapping headers: {e}")
@@ -157,27 +234,22 @@ class SelectorHelper:
     
     def get_cell_by_header(
         self, 
-        row: ElementHandle, 
+        row_cells: Sequence[str], 
         header: str, 
         column_map: Dict[str, int]
     ) -> str:
-        """Get cell text by header name using column mapping."""
-        try:
-            if header not in column_map:
-                return ""
-            
-            col_index = column_map[header]
-            cells = row.query_selector_all("td, th")
-            
-            if col_index < len(cells):
-                return normalize_text(extract_text_safe(cells[col_index]))
-            
-        except Exception as e:
-            self.logger.debug(f"Error getting cell for header '{header}': {e}")
+        """Get cell text by header name from a row's cell texts using column mapping.
+        
+        ``row_cells`` are the texts read for a whole row at once, e.g. a row
+        returned by ``_TABLE_ROWS_JS``, so the lookup needs no browser call.
+        """
+        col_index = column_map.get(header)
+        if col_index is None or col_index >= len(row_cells):
+            return ""
         
-        return ""
+        return normalize_text(row_cells[col_index])
     
-    def find_tab_by_text(
+    async def find_tab_by_text(
         self, 
         tab_texts: List[str], 
         tab_selectors: Optional[List[str]] = None
@@ -188,9 +260,7 @@ class SelectorHelper:
         
         for tab_selector in tab_selectors:
             try:
-                tabs = self.page.query_selector_all(tab_selector)
-                for tab in tabs:
-                    tab_text = normalize_text(extract_text_safe(tab))
+                for tab, tab_text in await self._get_tabs(tab_selector):
                     for target_text in tab_texts:
                         if self._header_matches(target_text, tab_text):
                             self.logger.debug(f"Found tab: '{target_text}' -> '{tab_text}'")
@@ -202,15 +272,15 @@ class SelectorHelper:
         self.logger.warning(f"No tab found for texts: {tab_texts}")
         return None
     
-    def click_tab_safe(self, tab: ElementHandle) -> bool:
+    async def click_tab_safe(self, tab: ElementHandle) -> bool:
         """Safely click tab element."""
         try:
             # Check if tab is already active
-            if tab.get_attribute("class") and "active" in tab.get_attribute("class"):
+            if "active" in (await tab.get_attribute("class") or ""):
                 self.logger.debug("Tab is already active")
                 return True
             
-            tab.click()
+            await tab.click()
             self.logger.debug("Tab clicked successfully")
             return True
             
@@ -218,7 +288,7 @@ class SelectorHelper:
             self.logger.error(f"Error clicking tab: {e}")
             return False
     
-    def wait_for_tab_content(
+    async def wait_for_tab_content(
         self, 
         content_selectors: Optional[List[str]] = None,
         timeout: int = 5000
@@ -227,17 +297,17 @@ class SelectorHelper:
         if content_selectors is None:
             content_selectors = [SELECTORS["detail_content"]]
         
-        for selector in content_selectors:
-            try:
-                self.page.wait_for_selector(selector, timeout=timeout)
-                return True
-            except Exception:
-                continue
+        # Wait for any of the selectors at once rather than one timeout each
+        try:
+            await self.page.wait_for_selector(", ".join(content_selectors), timeout=timeout)
+            return True
+        except Exception:
+            pass
         
         self.logger.warning("Tab content did not load within timeout")
         return False
     
-    def find_table_in_content(
+    async def find_table_in_content(
         self, 
         content_selectors: Optional[List[str]] = None
     ) -> Optional[ElementHandle]:
@@ -245,20 +315,16 @@ class SelectorHelper:
         if content_selectors is None:
             content_selectors = [SELECTORS["detail_content"]]
         
-        for content_selector in content_selectors:
-            try:
-                content = self.page.query_selector(content_selector)
-                if content:
-                    table = content.query_selector("table")
-                    if table:
-                        return table
-            except Exception as e:
-                self.logger.debug(f"Error finding table in content: {e}")
-                continue
+        # First table inside any content element, in one query; :is() keeps
+        # selector lists that contain commas grouped
+        try:
+            return await self.page.query_selector(f":is({', '.join(content_selectors)}) table")
+        except Exception as e:
+            self.logger.debug(f"Error finding table in content: {e}")
         
         return None
     
-    def extract_table_data(
+    async def extract_table_data(
         self, 
         table: ElementHandle,
         max_rows: Optional[int] = None
@@ -267,31 +333,20 @@ class SelectorHelper:
         data = []
         
         try:
-            # Get header row
-            header_row = table.query_selector("tr")
-            if not header_row:
+            # Read the header row and data rows in one round trip
+            rows = await table.evaluate(_TABLE_ROWS_JS, max_rows)
+            if not rows:
                 return data
             
             # Get headers
-            header_cells = header_row.query_selector_all("td, th")
-            headers = []
-            for cell in header_cells:
-                header_text = normalize_text(extract_text_safe(cell))
-                headers.append(header_text)
+            headers = [normalize_text(text) for text in rows[0]]
             
-            # Get data rows
-            rows = table.query_selector_all("tr")[1:]  # Skip header row
-            if max_rows:
-                rows = rows[:max_rows]
-            
-            for row in rows:
-                cells = row.query_selector_all("td, th")
-                row_data = {}
-                
-                for i, cell in enumerate(cells):
-                    if i < len(headers):
-                        cell_text = normalize_text(extract_text_safe(cell))
-                        row_data[headers[i]] = cell_text
+            for cells in rows[1:]:
+                # zip stops at the shorter of headers and cells
+                row_data = {
+                    header: normalize_text(cell_text)
+                    for header, cell_text in zip(headers, cells)
+                }
                 
                 if row_data:  # Only add non-empty rows
                     data.append(row_data)
@@ -301,22 +356,14 @@ class SelectorHelper:
         
         return data
     
-    def find_horse_links(self, table: ElementHandle) -> List[Tuple[str, str]]:
+    async def find_horse_links(self, table: ElementHandle) -> List[Tuple[str, str]]:
         """Find horse detail links in table rows."""
         links = []
         
         try:
-            rows = table.query_selector_all("tr")[1:]  # Skip header row
-            
-            for row in rows:
-                # Look for links in the row
-                link_elements = row.query_selector_all("a")
-                for link in link_elements:
-                    href = link.get_attribute("href")
-                    if href and ("Horse.aspx" in href or "horse" in href):
-                        link_text = normalize_text(extract_text_safe(link))
-                        links.append((link_text, href))
-                        break  # Only take first link per row
+            # First horse link per row, header row skipped, in one round trip
+            for link_text, href in await table.evaluate(_HORSE_LINKS_JS):
+                links.append((normalize_text(link_text), href))
             
         except Exception as e:
             self.logger.error(f"Error finding horse links: {e}")
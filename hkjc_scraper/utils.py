@@ -1,25 +1,66 @@
 """Utility functions for logging, retries, text normalization, and browser operations."""
 
+import asyncio
+import dataclasses
 import json
 import logging
 import random
 import re
-import time
+import sqlite3
+import tempfile
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
-from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Page, Route, TimeoutError as PlaywrightTimeoutError
+from pydantic import TypeAdapter
 
-from .constants import get_config
+from .constants import (
+    BLOCKED_RESOURCE_TYPES,
+    MAX_RACES_PER_MEETING,
+    RACECARD_URL_TEMPLATE,
+    VALID_COURSES_SET,
+    get_config,
+)
 from .models import HorseRecord
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
 
-def setup_logging(level: str = "INFO") -> logging.Logger:
-    """Set up structured logging with rich formatting."""
+# Horse ID in a detail URL: HorseId=HK_2024_K106 or HorseId=12345,
+# /horse/12345/, or horse_id=12345
+_HORSE_ID_RE = re.compile(
+    r'HorseId=(?P<code>[A-Z0-9_]+)|/horse/(?P<path>\d+)/|horse_id=(?P<query>\d+)'
+)
+
+# Race date as YYYY/MM/DD with zero-padded month and day
+_DATE_RE = re.compile(r"(\d{4})/(\d{2})/(\d{2})")
+
+# Parses and validates a checkpoint's JSON array in one pydantic-core pass
+_HORSE_RECORDS = TypeAdapter(List[HorseRecord])
+
+# Bound once so building a URL skips the template attribute lookup
+_format_racecard_url = RACECARD_URL_TEMPLATE.format
+
+
+def setup_logging(level: Optional[str] = None) -> logging.Logger:
+    """Set up structured logging with rich formatting.
+    
+    Without ``level`` this returns the package logger as configured, so the
+    ``logger=None`` fallbacks do not reset a level chosen by the CLI; a new
+    logger starts at INFO.
+    """
     logger = logging.getLogger("hkjc_scraper")
-    logger.setLevel(getattr(logging, level.upper()))
+    
+    if level is not None:
+        logger.setLevel(getattr(logging, level.upper()))
     
     if not logger.handlers:
+        if level is None:
+            logger.setLevel(logging.INFO)
         handler = logging.StreamHandler()
         formatter = logging.Formatter(
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -35,31 +76,41 @@ def normalize_text(text: str) -> str:
     if not text:
         return ""
     
-    # Replace full-width spaces with regular spaces
-    text = text.replace("　", " ")
-    
-    # Collapse multiple whitespace characters into single space
-    text = re.sub(r"\s+", " ", text)
-    
-    # Strip leading/trailing whitespace
-    return text.strip()
+    # str.split() without a separator splits on runs of Unicode whitespace,
+    # full-width (U+3000) and non-breaking (U+00A0) spaces included, and
+    # drops leading/trailing whitespace, all in one pass
+    return " ".join(text.split())
+
 
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON text or UTF-8 bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-def random_delay() -> None:
+
+def json_dumps(obj: Any) -> bytes:
+    """Encode obj as indented UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+async def random_delay() -> None:
     """Apply random delay between actions for respectful scraping."""
     config = get_config()
     delay_ms = random.randint(config["min_delay_ms"], config["max_delay_ms"])
-    time.sleep(delay_ms / 1000.0)
+    await asyncio.sleep(delay_ms / 1000.0)
 
 
-def retry_with_backoff(
+async def retry_with_backoff(
     func,
     max_retries: Optional[int] = None,
     base_delay_ms: Optional[int] = None,
     max_delay_ms: Optional[int] = None,
     logger: Optional[logging.Logger] = None,
 ) -> Any:
-    """Retry function with exponential backoff and jitter."""
+    """Retry coroutine function with exponential backoff and jitter."""
     config = get_config()
     max_retries = max_retries or config["max_retries"]
     base_delay_ms = base_delay_ms or config["retry_base_delay_ms"]
@@ -72,7 +123,7 @@ def retry_with_backoff(
     
     for attempt in range(max_retries + 1):
         try:
-            return func()
+            return await func()
         except Exception as e:
             last_exception = e
             if attempt < max_retries:
@@ -85,18 +136,19 @@ def retry_with_backoff(
                     f"Attempt {attempt + 1} failed: {e}. "
                     f"Retrying in {delay_ms}ms..."
                 )
-                time.sleep(delay_ms / 1000.0)
+                await asyncio.sleep(delay_ms / 1000.0)
             else:
                 logger.error(f"All {max_retries + 1} attempts failed. Last error: {e}")
     
     raise last_exception
 
 
-def wait_for_selector_safe(
+async def wait_for_selector_safe(
     page: Page,
     selector: str,
     timeout: Optional[int] = None,
     logger: Optional[logging.Logger] = None,
+    state: str = "visible",
 ) -> bool:
     """Safely wait for selector with timeout and logging."""
     config = get_config()
@@ -106,40 +158,62 @@ def wait_for_selector_safe(
         logger = setup_logging()
     
     try:
-        page.wait_for_selector(selector, timeout=timeout)
+        await page.wait_for_selector(selector, timeout=timeout, state=state)
         return True
     except PlaywrightTimeoutError:
         logger.warning(f"Selector '{selector}' not found within {timeout}ms")
         return False
 
 
-def extract_text_safe(
+async def block_unneeded_resources(route: Route) -> None:
+    """Route handler that aborts images, fonts, stylesheets and media."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def extract_text_safe(
     element,
     default: str = "",
     normalize: bool = True,
 ) -> str:
     """Safely extract text from element with fallback."""
     try:
-        text = element.inner_text() if hasattr(element, 'inner_text') else str(element)
-        return normalize_text(text) if normalize else text
+        text = await element.inner_text()
+    except AttributeError:
+        # Not an element handle; use its string form
+        text = str(element)
     except Exception:
         return default
+    
+    return normalize_text(text) if normalize else text
 
 
-def extract_href_safe(element, default: str = "") -> str:
+async def extract_href_safe(element, default: str = "") -> str:
     """Safely extract href from element with fallback."""
     try:
-        return element.get_attribute("href") or default
+        return await element.get_attribute("href") or default
     except Exception:
         return default
 
 
+def _write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Write then rename so concurrent readers and writers never see a partial file."""
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as f:
+        f.write(data)
+    Path(f.name).replace(path)
+
+
 def save_checkpoint(
-    data: List[HorseRecord],
+    data: List[Union[HorseRecord, Dict[str, Any]]],
     checkpoint_path: Union[str, Path],
     logger: Optional[logging.Logger] = None,
 ) -> None:
-    """Save checkpoint data to JSON file."""
+    """Save checkpoint data to JSON file.
+    
+    Records may be passed already dumped to dicts, which are written as is.
+    """
     if logger is None:
         logger = setup_logging()
     
@@ -148,10 +222,11 @@ def save_checkpoint(
         checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Convert to dict format for JSON serialization
-        checkpoint_data = [record.model_dump() for record in data]
-        
-        with open(checkpoint_path, "w", encoding="utf-8") as f:
-            json.dump(checkpoint_data, f, ensure_ascii=False, indent=2)
+        checkpoint_data = [
+            record if isinstance(record, dict) else record.model_dump()
+            for record in data
+        ]
+        _write_bytes_atomic(checkpoint_path, json_dumps(checkpoint_data))
         
         logger.info(f"Checkpoint saved: {len(data)} horses -> {checkpoint_path}")
     except Exception as e:
@@ -172,11 +247,7 @@ def load_checkpoint(
             logger.info(f"Checkpoint file not found: {checkpoint_path}")
             return []
         
-        with open(checkpoint_path, "r", encoding="utf-8") as f:
-            checkpoint_data = json.load(f)
-        
-        # Convert back to HorseRecord objects
-        records = [HorseRecord(**record_data) for record_data in checkpoint_data]
+        records = _HORSE_RECORDS.validate_json(checkpoint_path.read_bytes())
         logger.info(f"Checkpoint loaded: {len(records)} horses from {checkpoint_path}")
         return records
     except Exception as e:
@@ -184,6 +255,131 @@ def load_checkpoint(
         return []
 
 
+def save_storage_state(
+    state: Dict[str, Any],
+    state_path: Union[str, Path],
+    logger: Optional[logging.Logger] = None,
+) -> None:
+    """Save browser storage state (cookies, localStorage) to JSON file."""
+    if logger is None:
+        logger = setup_logging()
+    
+    try:
+        state_path = Path(state_path)
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        _write_bytes_atomic(state_path, json.dumps(state, ensure_ascii=False).encode("utf-8"))
+        
+        logger.debug(f"Storage state saved: {len(state.get('cookies', []))} cookies -> {state_path}")
+    except Exception as e:
+        logger.error(f"Failed to save storage state: {e}")
+
+
+def load_storage_state(
+    state_path: Union[str, Path],
+    logger: Optional[logging.Logger] = None,
+) -> Optional[Dict[str, Any]]:
+    """Load browser storage state from JSON file, if present."""
+    if logger is None:
+        logger = setup_logging()
+    
+    try:
+        state_path = Path(state_path)
+        if not state_path.exists():
+            return None
+        
+        state = json_loads(state_path.read_bytes())
+        logger.debug(f"Storage state loaded: {len(state.get('cookies', []))} cookies from {state_path}")
+        return state
+    except Exception as e:
+        logger.error(f"Failed to load storage state: {e}")
+        return None
+
+
+def open_detail_cache(
+    cache_path: Union[str, Path],
+    logger: Optional[logging.Logger] = None,
+) -> Optional[sqlite3.Connection]:
+    """Open the SQLite cache of scraped horse details, dropping earlier days."""
+    if logger is None:
+        logger = setup_logging()
+    
+    try:
+        cache_path = Path(cache_path)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        conn = sqlite3.connect(cache_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS horse_details ("
+            "url TEXT NOT NULL, day TEXT NOT NULL, details BLOB NOT NULL, "
+            "PRIMARY KEY (url, day))"
+        )
+        # Detail pages change at most daily, so only today's entries are kept
+        conn.execute("DELETE FROM horse_details WHERE day != ?", (date.today().isoformat(),))
+        conn.commit()
+        return conn
+    except Exception as e:
+        logger.error(f"Failed to open detail cache: {e}")
+        return None
+
+
+def load_cached_details(
+    conn: sqlite3.Connection,
+    detail_url: str,
+    logger: Optional[logging.Logger] = None,
+) -> Optional[Dict[str, Any]]:
+    """Load today's cached details for a horse detail URL, if present."""
+    if logger is None:
+        logger = setup_logging()
+    
+    try:
+        row = conn.execute(
+            "SELECT details FROM horse_details WHERE url = ? AND day = ?",
+            (detail_url, date.today().isoformat()),
+        ).fetchone()
+        if not row:
+            return None
+        
+        # Details are a subset of the final record's fields; rebuild their
+        # injury and past-run dataclasses with the record schema
+        record = HorseRecord.model_validate_json(row[0])
+        return {field: getattr(record, field) for field in record.model_fields_set}
+    except Exception as e:
+        logger.debug(f"Failed to load cached details: {e}")
+        return None
+
+
+def _details_to_json(details: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert the record dataclasses in scraped details to plain dicts."""
+    return {
+        key: [
+            dataclasses.asdict(item) if dataclasses.is_dataclass(item) else item
+            for item in value
+        ] if isinstance(value, list) else value
+        for key, value in details.items()
+    }
+
+
+def save_cached_details(
+    conn: sqlite3.Connection,
+    detail_url: str,
+    details: Dict[str, Any],
+    logger: Optional[logging.Logger] = None,
+) -> None:
+    """Cache scraped details for a horse detail URL under today's date."""
+    if logger is None:
+        logger = setup_logging()
+    
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO horse_details (url, day, details) VALUES (?, ?, ?)",
+            (detail_url, date.today().isoformat(), json_dumps(_details_to_json(details))),
+        )
+        conn.commit()
+    except Exception as e:
+        logger.debug(f"Failed to cache details: {e}")
+
+
 def save_final_output(
     data: List[HorseRecord],
     output_path: Union[str, Path],
@@ -199,19 +395,23 @@ def save_final_output(
         
         # Convert to dict format for JSON serialization
         output_data = [record.model_dump() for record in data]
-        
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
+        output_path.write_bytes(json_dumps(output_data))
         
         logger.info(f"Final output saved: {len(data)} horses -> {output_path}")
     except Exception as e:
         logger.error(f"Failed to save final output: {e}")
 
 
+@lru_cache(maxsize=256)
 def validate_date_format(date_str: str) -> bool:
     """Validate date string format (YYYY/MM/DD)."""
+    match = _DATE_RE.fullmatch(date_str)
+    if not match:
+        return False
+    
+    # Reject dates that do not exist, e.g. 2025/02/30
     try:
-        time.strptime(date_str, "%Y/%m/%d")
+        date(*map(int, match.groups()))
         return True
     except ValueError:
         return False
@@ -219,20 +419,32 @@ def validate_date_format(date_str: str) -> bool:
 
 def validate_course(course: str) -> bool:
     """Validate racecourse code."""
-    from .constants import VALID_COURSES
-    return course.upper() in VALID_COURSES
+    return course.upper() in VALID_COURSES_SET
 
 
 def validate_race_number(raceno: int) -> bool:
     """Validate race number."""
-    return 1 <= raceno <= 12
+    return 1 <= raceno <= MAX_RACES_PER_MEETING
 
 
 def build_racecard_url(date: str, course: str, raceno: int) -> str:
     """Build racecard URL from parameters."""
-    from .constants import RACECARD_URL_TEMPLATE
-    return RACECARD_URL_TEMPLATE.format(
+    return _format_racecard_url(
         date=date,
         course=course.upper(),
         raceno=raceno
     )
+
+
+@lru_cache(maxsize=4096)
+def parse_horse_id(url: str) -> Optional[str]:
+    """Extract horse ID from a horse detail URL."""
+    match = _HORSE_ID_RE.search(url)
+    if not match:
+        return None
+    
+    horse_id = match.group(match.lastgroup)
+    if match.lastgroup == "code":
+        # HK_2024_K106 -> K106 (last segment after the last underscore)
+        return horse_id.rsplit('_', 1)[-1]
+    return horse_id
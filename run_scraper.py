@@ -4,37 +4,22 @@ Simple script to run the HKJC scraper and serve the results via a local web serv
 This allows users to get real data from the Python scraper.
 """
 
-import subprocess
 import json
 import sys
-import os
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 import webbrowser
 import threading
 import time
 
+from hkjc_scraper.main import run as scrape_race
+from hkjc_scraper.utils import setup_logging
+
 def run_scraper(date, course, raceno):
     """Run the HKJC scraper with the given parameters."""
     try:
-        # Run the scraper
-        result = subprocess.run([
-            sys.executable, '-m', 'hkjc_scraper',
-            '--date', date,
-            '--course', course,
-            '--raceno', str(raceno),
-            '--out', 'scraped_data.json',
-            '--log-level', 'INFO'
-        ], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
-        
-        if result.returncode != 0:
-            print(f"Error running scraper: {result.stderr}")
-            return None
-            
-        # Read the output file
-        with open('scraped_data.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-        return data
+        # Run the scraper in-process and return the records as written by the CLI
+        horses = scrape_race(date, course, raceno, logger=setup_logging('INFO'))
+        return [horse.model_dump() for horse in horses]
         
     except Exception as e:
         print(f"Error: {e}")
@@ -79,7 +64,7 @@ def main():
         print("Failed to scrape data")
         sys.exit(1)
     
-    print(f"Successfully scraped {len(data.get('horses', []))} horses")
+    print(f"Successfully scraped {len(data)} horses")
     
     # Start a local web server
     port = 8080
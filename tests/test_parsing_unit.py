@@ -1,65 +1,102 @@
 """Unit tests for HTML parsing helpers."""
 
+import asyncio
+
 import pytest
 from unittest.mock import Mock
 
 from hkjc_scraper.models import HorseRecord, InjuryRecord, PastRunRecord, ToplineData
-from hkjc_scraper.utils import normalize_text, validate_date_format, validate_course, validate_race_number
+from hkjc_scraper.selectors import SelectorHelper
+from hkjc_scraper.utils import (
+    build_racecard_url,
+    load_cached_details,
+    load_checkpoint,
+    load_storage_state,
+    normalize_text,
+    open_detail_cache,
+    save_cached_details,
+    save_checkpoint,
+    save_storage_state,
+    validate_course,
+    validate_date_format,
+    validate_race_number,
+)
+
+
+@pytest.fixture(scope="module")
+def helper():
+    """Selector helper over a mock page, shared by the header matching cases."""
+    return SelectorHelper(Mock())
 
 
 class TestTextNormalization:
     """Test text normalization functions."""
     
-    def test_normalize_text_basic(self):
-        """Test basic text normalization."""
-        assert normalize_text("  hello  world  ") == "hello world"
-        assert normalize_text("") == ""
-        assert normalize_text(None) == ""
-    
-    def test_normalize_text_fullwidth_spaces(self):
-        """Test normalization of full-width spaces."""
-        assert normalize_text("hello　world") == "hello world"
-        assert normalize_text("　　hello　　") == "hello"
-    
-    def test_normalize_text_multiple_spaces(self):
-        """Test normalization of multiple spaces."""
-        assert normalize_text("hello    world") == "hello world"
-        assert normalize_text("hello\t\nworld") == "hello world"
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            # Basic normalization
+            ("  hello  world  ", "hello world"),
+            ("", ""),
+            (None, ""),
+            # Full-width spaces
+            ("hello　world", "hello world"),
+            ("　　hello　　", "hello"),
+            # Multiple spaces
+            ("hello    world", "hello world"),
+            ("hello\t\nworld", "hello world"),
+        ],
+        ids=[
+            "padded", "empty", "none",
+            "fullwidth-inner", "fullwidth-padded",
+            "multiple-spaces", "tab-newline",
+        ],
+    )
+    def test_normalize_text(self, text, expected):
+        """Test text normalization."""
+        assert normalize_text(text) == expected
 
 
 class TestValidation:
     """Test input validation functions."""
     
-    def test_validate_date_format(self):
+    @pytest.mark.parametrize(
+        "date_str,expected",
+        [
+            ("2025/09/17", True),
+            ("2025/12/31", True),
+            ("2025/01/01", True),
+            ("2025-09-17", False),
+            ("25/09/17", False),
+            ("2025/9/17", False),
+            ("invalid", False),
+        ],
+    )
+    def test_validate_date_format(self, date_str, expected):
         """Test date format validation."""
-        assert validate_date_format("2025/09/17") is True
-        assert validate_date_format("2025/12/31") is True
-        assert validate_date_format("2025/01/01") is True
-        
-        assert validate_date_format("2025-09-17") is False
-        assert validate_date_format("25/09/17") is False
-        assert validate_date_format("2025/9/17") is False
-        assert validate_date_format("invalid") is False
+        assert validate_date_format(date_str) is expected
     
-    def test_validate_course(self):
+    @pytest.mark.parametrize(
+        "course,expected",
+        [("HV", True), ("ST", True), ("hv", True), ("st", True), ("ABC", False), ("", False)],
+        ids=["HV", "ST", "hv", "st", "ABC", "empty"],
+    )
+    def test_validate_course(self, course, expected):
         """Test course validation."""
-        assert validate_course("HV") is True
-        assert validate_course("ST") is True
-        assert validate_course("hv") is True
-        assert validate_course("st") is True
-        
-        assert validate_course("ABC") is False
-        assert validate_course("") is False
+        assert validate_course(course) is expected
     
-    def test_validate_race_number(self):
+    @pytest.mark.parametrize(
+        "raceno,expected",
+        [(1, True), (6, True), (12, True), (0, False), (13, False), (-1, False)],
+    )
+    def test_validate_race_number(self, raceno, expected):
         """Test race number validation."""
-        assert validate_race_number(1) is True
-        assert validate_race_number(6) is True
-        assert validate_race_number(12) is True
-        
-        assert validate_race_number(0) is False
-        assert validate_race_number(13) is False
-        assert validate_race_number(-1) is False
+        assert validate_race_number(raceno) is expected
+    
+    def test_build_racecard_url(self):
+        """Test race card URL construction."""
+        url = build_racecard_url("2025/09/17", "hv", 4)
+        assert url.endswith("RaceCard.aspx?RaceDate=2025/09/17&Racecourse=HV&RaceNo=4")
 
 
 class TestModels:
@@ -140,29 +177,243 @@ class TestModels:
         assert isinstance(topline.當前評分, str)
 
 
+class TestCheckpoint:
+    """Test checkpoint persistence."""
+    
+    def test_checkpoint_round_trip(self, tmp_path):
+        """Test that saved checkpoints load back into equal records."""
+        horses = [
+            HorseRecord(
+                馬號="1",
+                馬名="友得盈",
+                傷病記錄=[{"date": "21/04/2025", "description": "Test injury"}],
+            )
+        ]
+        checkpoint_path = tmp_path / "race.chk.json"
+        
+        save_checkpoint(horses, checkpoint_path)
+        assert load_checkpoint(checkpoint_path) == horses
+        
+        # Records already dumped to dicts are written the same way
+        save_checkpoint([horse.model_dump() for horse in horses], checkpoint_path)
+        assert load_checkpoint(checkpoint_path) == horses
+    
+    def test_load_missing_checkpoint(self, tmp_path):
+        """Test loading a checkpoint that does not exist."""
+        assert load_checkpoint(tmp_path / "missing.json") == []
+    
+    def test_storage_state_round_trip(self, tmp_path):
+        """Test that saved browser storage state loads back unchanged."""
+        state = {"cookies": [{"name": "ASP.NET_SessionId", "value": "abc"}], "origins": []}
+        state_path = tmp_path / "hkjc_state.json"
+        
+        save_storage_state(state, state_path)
+        assert load_storage_state(state_path) == state
+        assert load_storage_state(tmp_path / "missing.json") is None
+    
+    def test_detail_cache_round_trip(self, tmp_path):
+        """Test horse details are cached by URL for the current day."""
+        conn = open_detail_cache(tmp_path / "cache.db")
+        details = {
+            "馬匹ID": "K106",
+            "傷病記錄": [InjuryRecord(date="2024/01/01", description="跛行")],
+            "往績紀錄": [PastRunRecord(position="1")],
+        }
+        
+        assert load_cached_details(conn, "Horse.aspx?HorseId=K106") is None
+        save_cached_details(conn, "Horse.aspx?HorseId=K106", details)
+        assert load_cached_details(conn, "Horse.aspx?HorseId=K106") == details
+        conn.close()
+        
+        # Entries survive reopening on the same day
+        conn = open_detail_cache(tmp_path / "cache.db")
+        assert load_cached_details(conn, "Horse.aspx?HorseId=K106") == details
+        conn.close()
+
+
+class TestHorseDetailParsing:
+    """Test pure-Python parsing in the horse detail scraper."""
+    
+    def test_extract_horse_id_from_url(self):
+        """Test horse ID extraction from the supported URL shapes."""
+        from hkjc_scraper.horse_detail import HorseDetailScraper
+        
+        scraper = HorseDetailScraper(browser=None)
+        
+        assert scraper._extract_horse_id_from_url(
+            "https://racing.hkjc.com/racing/information/Chinese/Horse/Horse.aspx?HorseId=HK_2024_K106"
+        ) == "K106"
+        assert scraper._extract_horse_id_from_url("Horse.aspx?HorseId=12345") == "12345"
+        assert scraper._extract_horse_id_from_url("/horse/12345/") == "12345"
+        assert scraper._extract_horse_id_from_url("detail?horse_id=12345") == "12345"
+        assert scraper._extract_horse_id_from_url("https://racing.hkjc.com/") is None
+    
+    def test_parse_past_runs_tables(self):
+        """Test past run parsing from a basic race results table."""
+        from hkjc_scraper.horse_detail import HorseDetailScraper
+        
+        scraper = HorseDetailScraper(browser=None)
+        tables = [
+            [["馬名", "友得盈"]],
+            [
+                ["日期", "場地", "途程", "騎師", "名次"],
+                ["01/09/2025", "跑馬地", "1200", "潘頓", "1"],
+                ["15/08/2025", "沙田", "1400", "布文", " 3 "],
+            ],
+        ]
+        
+        past_runs = scraper._parse_past_runs_tables(tables)
+        
+        assert [run.race_date for run in past_runs] == ["01/09/2025", "15/08/2025"]
+        assert past_runs[0].venue == "跑馬地"
+        assert past_runs[1].position == "3"
+    
+    def test_past_runs_fall_back_to_page_text(self):
+        """Test past runs are parsed from page text when no table matches."""
+        from hkjc_scraper.horse_detail import HorseDetailScraper
+        
+        scraper = HorseDetailScraper(browser=None)
+        page_text = "場次: 名次 | 843: 06 | 779: 08 | 730: 10"
+        
+        past_runs = scraper._scrape_past_runs_from_main_page([], page_text)
+        
+        assert [run.position for run in past_runs] == ["06", "08", "10"]
+    
+    def test_parse_injury_index(self):
+        """Test injury indexing, including continuation rows."""
+        from hkjc_scraper.horse_detail import HorseDetailScraper
+        
+        scraper = HorseDetailScraper(browser=None)
+        rows = [
+            ["烙印編號", "馬名", "日期", "詳情", "通過日期"],
+            ["H001", "其他馬", "01/01/2025", "流鼻血", "-"],
+            ["K106", "友得盈", "21/04/2025", "右前腿不良於行", "05/05/2025"],
+            ["02/06/2025", "", "跛行", "-", ""],
+            ["H002", "另一馬", "03/03/2025", "咳嗽", "-"],
+        ]
+        
+        injury_index = scraper._parse_injury_index(rows)
+        injuries = injury_index["友得盈"]
+        
+        assert "其他馬" in injury_index and "另一馬" in injury_index
+        assert [injury.date for injury in injuries] == ["21/04/2025", "02/06/2025"]
+        assert injuries[0].description == "右前腿不良於行"
+        assert injuries[1].description == "跛行"
+    
+    def test_scrape_many_preserves_order(self):
+        """Test concurrent detail scraping returns results in input order."""
+        from hkjc_scraper.horse_detail import HorseDetailScraper
+        
+        class FakeDetailScraper(HorseDetailScraper):
+            async def scrape_horse_details(self, detail_url):
+                if detail_url == "bad":
+                    raise RuntimeError("page failed")
+                await asyncio.sleep(0.01 if detail_url == "first" else 0)
+                return {"url": detail_url}
+        
+        scraper = FakeDetailScraper(browser=None)
+        finished = []
+        
+        results = asyncio.run(scraper.scrape_many(
+            ["first", "bad", "third"],
+            lambda index, details: finished.append(index),
+        ))
+        
+        assert results == [{"url": "first"}, None, {"url": "third"}]
+        assert sorted(finished) == [0, 1, 2]
+        assert finished[-1] == 0
+    
+    def test_read_detail_html(self):
+        """Test reading server-rendered horse page HTML without a browser."""
+        pytest.importorskip("selectolax.lexbor")
+        from hkjc_scraper.horse_detail import HorseDetailScraper
+        
+        scraper = HorseDetailScraper(browser=None)
+        html = """<html><head><title>友得盈 - 馬匹資料</title></head><body><h1>友得盈</h1>
+            <table><tr><td>
+                <table><tr><th>日期</th><th>名次</th></tr><tr><td>01/09/2025</td><td>1</td></tr></table>
+            </td></tr></table>
+            <div>國際評分: 95</div>
+            <p><b>年齡</b> 5</p>
+            <script>var ignored = "年齡";</script>
+        </body></html>"""
+        
+        content = scraper._read_detail_html(html)
+        
+        assert len(content["tables"]) == 2
+        assert content["tables"][1] == [["日期", "名次"], ["01/09/2025", "1"]]
+        assert content["rating"] == "95"
+        assert content["horse_name"] == "友得盈"
+        assert [normalize_text(parent) for _, parent in content["profile_matches"]] == ["年齡 5"]
+
+
+class TestRaceCardParsing:
+    """Test race card row parsing."""
+    
+    def test_extract_horse_data(self):
+        """Test building topline data from a row's cell texts and links."""
+        from hkjc_scraper.racecard import RaceCardScraper
+        
+        scraper = RaceCardScraper(browser=None)
+        row = {
+            "cells": ["1", " 友得盈 ", "潘頓"],
+            "hrefs": ["/racing/information/Chinese/Horse/Horse.aspx?HorseId=HK_2024_K106"],
+        }
+        
+        horse = scraper._extract_horse_data(row, {"編號": 0, "馬名": 1, "騎師": 2, "獨贏": 5})
+        
+        assert horse.馬號 == "1"
+        assert horse.馬名 == "友得盈"
+        assert horse.騎師 == "潘頓"
+        assert horse.獨贏 == ""
+        assert horse.馬匹ID == "K106"
+        assert horse.detail_url == (
+            "https://racing.hkjc.com/racing/information/Chinese/Horse/Horse.aspx?HorseId=HK_2024_K106"
+        )
+
+
 class TestSelectorHelper:
     """Test selector helper functionality."""
     
-    def test_header_matching(self):
+    @pytest.mark.parametrize(
+        "expected,actual,matches",
+        [
+            # Exact matches
+            ("馬號", "馬號", True),
+            ("馬名", "馬名", True),
+            # Contains matches
+            ("馬號", "馬號 (Horse No.)", True),
+            ("馬名", "馬名 (Horse Name)", True),
+            # No matches
+            ("馬號", "騎師", False),
+            ("馬名", "練馬師", False),
+        ],
+    )
+    def test_header_matching(self, helper, expected, actual, matches):
         """Test header text matching logic."""
-        from hkjc_scraper.selectors import SelectorHelper
-        
-        # Mock page object
-        mock_page = Mock()
-        helper = SelectorHelper(mock_page)
+        assert helper._header_matches(expected, actual) is matches
+    
+    @pytest.mark.parametrize(
+        "headers, expected_map",
+        [
+            (["編號", "馬名", "評分", "國際評分"], {"編號": 0, "馬名": 1, "評分": 2, "國際評分": 3}),
+            (["編號", "馬名", "評分", "評分+/-", "國際評分"], {"編號": 0, "馬名": 1, "評分": 2, "國際評分": 4}),
+            (["編號", "馬名", "國際評分", "評分", "評分+/-"], {"編號": 0, "馬名": 1, "評分": 3, "國際評分": 2}),
+            (["編號", "馬名", "評分+/-", "評分"], {"編號": 0, "馬名": 1, "評分": 3}),
+        ],
+    )
+    def test_header_column_map(self, headers, expected_map):
+        """Test that each expected header maps to its own column."""
+        async def evaluate(js):
+            return {"headers": headers, "firstRow": headers}
         
-        # Test exact matches
-        assert helper._header_matches("馬號", "馬號") is True
-        assert helper._header_matches("馬名", "馬名") is True
+        table = Mock()
+        table.evaluate = evaluate
+        helper = SelectorHelper(Mock())
         
-        # Test contains matches
-        assert helper._header_matches("馬號", "馬號 (Horse No.)") is True
-        assert helper._header_matches("馬名", "馬名 (Horse Name)") is True
+        column_map = asyncio.run(helper.get_header_column_map(table, ["編號", "馬名", "評分", "國際評分"]))
         
-        # Test no matches
-        assert helper._header_matches("馬號", "騎師") is False
-        assert helper._header_matches("馬名", "練馬師") is False
-
+        assert column_map == expected_map
 
 if __name__ == "__main__":
     pytest.main([__file__])